@@ -1,8 +1,8 @@
-from rest_framework import serializers
 from .models import Address
+from backend.serializers import DynamicFieldsModelSerializer
 
 
-class AddressSerializer(serializers.ModelSerializer):
+class AddressSerializer(DynamicFieldsModelSerializer):
     """Serializer for Address model"""
     class Meta:
         model = Address
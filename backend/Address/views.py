@@ -5,11 +5,12 @@ from django.db import IntegrityError
 import logging
 from .models import Address
 from .serializers import AddressSerializer
+from backend.prefetch import AutoPrefetchMixin
 
 logger = logging.getLogger(__name__)
 
 
-class AddressListView(generics.ListCreateAPIView):
+class AddressListView(AutoPrefetchMixin, generics.ListCreateAPIView):
     """List user's addresses and create new address"""
     serializer_class = AddressSerializer
     permission_classes = [IsAuthenticated]
@@ -21,7 +22,7 @@ class AddressListView(generics.ListCreateAPIView):
         return Address.objects.filter(user=self.request.user)
 
 
-class AddressDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AddressDetailView(AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific address"""
     serializer_class = AddressSerializer
     permission_classes = [IsAuthenticated]
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AuthuserConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'AuthUser'
+
+    def ready(self):
+        from django.contrib.auth.signals import user_logged_in
+        from . import signals  # noqa: F401
+        from .last_login import record_login
+
+        # Buffer last_login writes instead of saving the user on every login
+        user_logged_in.disconnect(dispatch_uid='update_last_login')
+        user_logged_in.connect(record_login, dispatch_uid='update_last_login')
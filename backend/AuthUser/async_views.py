@@ -0,0 +1,175 @@
+"""
+Async login and registration for ASGI deployments (backend/asgi.py).
+
+Most of a login or registration is PBKDF2 work. The sync views run it on the
+request thread, so a sync worker can serve one login at a time. These views
+run the hashing on a bounded thread pool (AUTH_HASHING_THREADS) and use the
+async ORM for lookups, so one event loop keeps serving other requests while
+passwords are hashed. hashlib releases the GIL while hashing, so the pool
+also uses several cores.
+
+They are plain Django async views (DRF views are sync-only) that reuse the DRF
+serializers for validation and return the same payloads and cookies as
+UserLoginView / UserRegistrationView. Login checks the password against the
+user row directly, like ModelBackend; custom AUTHENTICATION_BACKENDS are not
+consulted.
+"""
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from .models import User
+from .serializers import UserLoginSerializer, UserRegistrationSerializer, UserSerializer
+from .tokens import FilteredRefreshToken
+from . import last_login
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _hashing_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'AUTH_HASHING_THREADS', 4),
+            thread_name_prefix='password-hashing',
+        )
+    return _executor
+
+
+async def run_hashing(func, *args):
+    """Run a password hashing function on the hashing pool"""
+    return await asyncio.get_running_loop().run_in_executor(_hashing_executor(), func, *args)
+
+
+def _parse_body(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def set_auth_cookies(response, access_token, refresh):
+    response.set_cookie(
+        key=settings.SIMPLE_JWT['AUTH_COOKIE'],
+        value=str(access_token),
+        max_age=settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds(),
+        httponly=settings.SIMPLE_JWT['AUTH_COOKIE_HTTP_ONLY'],
+        samesite=settings.SIMPLE_JWT['AUTH_COOKIE_SAMESITE'],
+        secure=settings.SIMPLE_JWT['AUTH_COOKIE_SECURE'],
+    )
+    response.set_cookie(
+        key=settings.SIMPLE_JWT['AUTH_COOKIE_REFRESH'],
+        value=str(refresh),
+        max_age=settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds(),
+        httponly=settings.SIMPLE_JWT['AUTH_COOKIE_HTTP_ONLY'],
+        samesite=settings.SIMPLE_JWT['AUTH_COOKIE_SAMESITE'],
+        secure=settings.SIMPLE_JWT['AUTH_COOKIE_SECURE'],
+    )
+
+
+async def _token_response(user, message, status):
+    refresh = await sync_to_async(FilteredRefreshToken.for_user)(user)
+    access_token = refresh.access_token
+    response = JsonResponse({
+        'user': UserSerializer(user).data,
+        'access': str(access_token),
+        'refresh': str(refresh),
+        'message': message,
+    }, status=status)
+    set_auth_cookies(response, access_token, refresh)
+    return response
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncUserLoginView(View):
+    """Async counterpart of UserLoginView"""
+    http_method_names = ['post', 'options']
+
+    async def post(self, request, *args, **kwargs):
+        data = _parse_body(request)
+        if data is None:
+            return JsonResponse({'error': 'Request body must be a JSON object'}, status=400)
+        serializer = UserLoginSerializer(data=data)
+        if not serializer.is_valid():
+            return JsonResponse({'error': serializer.errors}, status=400)
+        username = serializer.validated_data['username']
+        password = serializer.validated_data['password']
+
+        try:
+            user = await User.objects.filter(**{User.USERNAME_FIELD: username}).afirst()
+            if user is None:
+                # Spend the same hashing time as a real check, like ModelBackend
+                await run_hashing(make_password, password)
+                valid = False
+            else:
+                valid = await run_hashing(check_password, password, user.password) and user.is_active
+        except Exception as e:
+            logger.error(f"Error during authentication: {str(e)}")
+            return JsonResponse({'error': f'Authentication error occurred: {str(e)}'}, status=500)
+        if not valid:
+            return JsonResponse({'error': 'Invalid credentials'}, status=401)
+
+        try:
+            if identify_hasher(user.password).must_update(user.password):
+                # Re-hash with the current hasher settings, as check_password's setter would
+                user.password = await run_hashing(make_password, password)
+                # save() rather than update() so the user_cache entry is dropped
+                await user.asave(update_fields=['password'])
+            await sync_to_async(last_login.touch)(user)
+            return await _token_response(
+                user, 'Login successful. Tokens stored in cookies and returned in response.', 200
+            )
+        except Exception as e:
+            logger.error(f"Error creating JWT tokens: {str(e)}")
+            return JsonResponse({'error': f'Error generating authentication tokens: {str(e)}'}, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncUserRegistrationView(View):
+    """Async counterpart of UserRegistrationView"""
+    http_method_names = ['post', 'options']
+
+    async def post(self, request, *args, **kwargs):
+        data = _parse_body(request)
+        if data is None:
+            return JsonResponse({'error': 'Request body must be a JSON object'}, status=400)
+        serializer = UserRegistrationSerializer(data=data)
+        # Unique username/email validators query the database
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse({'error': serializer.errors}, status=400)
+
+        fields = dict(serializer.validated_data)
+        password = fields.pop('password')
+        fields.pop('password2')
+        fields['username'] = User.normalize_username(fields['username'])
+        fields['email'] = User.objects.normalize_email(fields.get('email', ''))
+
+        try:
+            fields['password'] = await run_hashing(make_password, password)
+            user = await User.objects.acreate(**fields)
+        except IntegrityError as e:
+            logger.error(f"Integrity error during user registration: {str(e)}")
+            return JsonResponse({'error': 'Username or email already exists'}, status=400)
+        except Exception as e:
+            logger.error(f"Error creating user: {str(e)}")
+            return JsonResponse({'error': f'Error creating user account: {str(e)}'}, status=500)
+
+        try:
+            return await _token_response(
+                user, 'Registration successful. Tokens stored in cookies and returned in response.', 201
+            )
+        except Exception as e:
+            logger.error(f"Error creating JWT tokens: {str(e)}")
+            return JsonResponse({'error': f'Error generating authentication tokens: {str(e)}'}, status=500)
@@ -1,5 +1,8 @@
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 from django.conf import settings
+from . import token_cache, user_cache
 
 
 class CookieJWTAuthentication(JWTAuthentication):
@@ -9,23 +12,36 @@ class CookieJWTAuthentication(JWTAuthentication):
     """
     
     def authenticate(self, request):
-        # Try to get token from cookie first
         header = self.get_header(request)
-        if header is None:
-            # Try to get from cookie
-            access_token = request.COOKIES.get(settings.SIMPLE_JWT.get('AUTH_COOKIE', 'access_token'))
-            if access_token:
-                # Set the token in the request header format for processing
-                request.META['HTTP_AUTHORIZATION'] = f"Bearer {access_token}"
-                header = self.get_header(request)
-        
-        if header is None:
-            return None
-        
-        raw_token = self.get_raw_token(header)
+        if header is not None:
+            raw_token = self.get_raw_token(header)
+        else:
+            # No Authorization header: validate the access token cookie as is
+            raw_token = request.COOKIES.get(settings.SIMPLE_JWT.get('AUTH_COOKIE', 'access_token')) or None
+
         if raw_token is None:
             return None
 
         validated_token = self.get_validated_token(raw_token)
         return self.get_user(validated_token), validated_token
 
+    def get_validated_token(self, raw_token):
+        """Verify raw_token once and reuse the result until the token expires"""
+        return token_cache.get_or_validate(raw_token, super().get_validated_token)
+
+    def get_user(self, validated_token):
+        """Resolve the token's user through the user cache (no query on a hit)"""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        user = user_cache.get_user(user_id)
+        if user is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != getattr(user, user_cache.REVOKE_HASH):
+                raise AuthenticationFailed("The user's password has been changed.", code='password_changed')
+        return user
@@ -0,0 +1,163 @@
+"""
+In-memory Bloom filter over the blacklisted refresh token JTIs.
+
+Every refresh checks whether the presented token is blacklisted. Almost none
+are, so the filter answers "definitely not blacklisted" without a query and
+only possible hits (real ones or the rare false positive) go to the
+token_blacklist tables.
+
+Each process builds its filter on first use and then follows the other
+processes through a generation counter in the shared cache: blacklisting a
+token bumps it once committed, and a process that sees a new generation adds
+the rows with a higher id than the last one it loaded. It then checks the
+number of rows up to that id against what it has loaded; a row that was
+committed after a higher id (or a purge) shows up as a mismatch and triggers
+a full rebuild.
+
+The generation counter only reaches other processes through a shared cache
+(Redis, Memcached, database). With a per-process backend such as LocMemCache
+another worker would keep accepting blacklisted tokens, so the filter is
+switched off there and every refresh is checked against the database.
+"""
+import hashlib
+import logging
+import math
+import threading
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'token-blacklist:generation'
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings"""
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.sha256(item.encode()).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return ((first + index * second) % self.size for index in range(self.hash_count))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+_lock = threading.Lock()
+_state = {'filter': None, 'last_id': 0, 'count': 0, 'generation': None}
+_unshared_warned = False
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _rows(after_id):
+    return (
+        BlacklistedToken.objects.filter(id__gt=after_id)
+        .order_by('id')
+        .values_list('id', 'token__jti')
+        .iterator(chunk_size=5000)
+    )
+
+
+def _load(after_id, bloom):
+    """Add the rows after after_id; returns (last id loaded, rows loaded)"""
+    last_id, loaded = after_id, 0
+    for row_id, jti in _rows(after_id):
+        bloom.add(jti)
+        last_id, loaded = row_id, loaded + 1
+    return last_id, loaded
+
+
+def _rebuild(generation):
+    count = BlacklistedToken.objects.count()
+    bloom = BloomFilter(
+        max(_setting('TOKEN_BLACKLIST_FILTER_CAPACITY', 100000), count * 2),
+        _setting('TOKEN_BLACKLIST_FILTER_ERROR_RATE', 0.01),
+    )
+    last_id, loaded = _load(0, bloom)
+    _state.update(filter=bloom, last_id=last_id, count=loaded, generation=generation)
+
+
+def rebuild():
+    """Rebuild this process's filter from the blacklist table"""
+    with _lock:
+        _rebuild(cache.get(GENERATION_KEY, 0))
+
+
+def _sync():
+    if _state['filter'] is None:
+        rebuild()
+        return
+    generation = cache.get(GENERATION_KEY, 0)
+    if generation == _state['generation']:
+        return
+    with _lock:
+        last_id, loaded = _load(_state['last_id'], _state['filter'])
+        count = _state['count'] + loaded
+        if BlacklistedToken.objects.filter(id__lte=last_id).count() != count:
+            # A lower id committed late, or rows were purged
+            _rebuild(generation)
+            return
+        _state.update(last_id=last_id, count=count, generation=generation)
+
+
+def shared_cache():
+    """Whether the default cache is shared between processes"""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def enabled():
+    """Whether refreshes consult the filter; needs a shared cache"""
+    global _unshared_warned
+    if not _setting('TOKEN_BLACKLIST_FILTER_ENABLED', False):
+        return False
+    if not shared_cache():
+        if not _unshared_warned:
+            _unshared_warned = True
+            logger.warning(
+                "TOKEN_BLACKLIST_FILTER_ENABLED needs a shared cache backend; "
+                "blacklist filter disabled"
+            )
+        return False
+    return True
+
+
+def might_be_blacklisted(jti):
+    """False means jti is certainly not blacklisted; True needs a DB check"""
+    if not enabled():
+        return True
+    _sync()
+    return jti in _state['filter']
+
+
+def _bump_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 0, timeout=None)
+        cache.incr(GENERATION_KEY)
+
+
+def record(jti):
+    """Add a newly blacklisted jti here and tell other processes once committed"""
+    if _state['filter'] is not None:
+        _state['filter'].add(jti)
+    transaction.on_commit(_bump_generation)
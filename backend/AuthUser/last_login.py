@@ -0,0 +1,99 @@
+"""
+Write-behind buffer for User.last_login.
+
+Logins only record the timestamp in memory. A background thread writes all
+pending timestamps with a single UPDATE ... SET last_login = CASE id WHEN ...
+every LAST_LOGIN_FLUSH_INTERVAL seconds, so a burst of logins costs one
+write instead of one per login. The buffer is also flushed when it holds
+LAST_LOGIN_BUFFER_MAX users and at interpreter exit. A value can therefore
+be up to LAST_LOGIN_FLUSH_INTERVAL seconds late in the database (or lost if
+the process is killed hard), which is fine for an informational column.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_pending = {}
+_lock = threading.Lock()
+_flusher = None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def touch(user, when=None):
+    """Record a login for user; the database is updated by the next flush"""
+    when = when or timezone.now()
+    user.last_login = when
+    if _setting('LAST_LOGIN_FLUSH_INTERVAL', 5) <= 0:
+        _write({user.pk: when})
+        return
+    with _lock:
+        _pending[user.pk] = when
+        full = len(_pending) >= _setting('LAST_LOGIN_BUFFER_MAX', 1000)
+    _start_flusher()
+    if full:
+        flush()
+
+
+def record_login(sender, user, **kwargs):
+    """user_logged_in receiver replacing django.contrib.auth's update_last_login"""
+    touch(user)
+
+
+def _write(pending):
+    """One UPDATE setting each user's last_login through a CASE on the id"""
+    user_model = get_user_model()
+    return user_model._default_manager.filter(pk__in=list(pending)).update(
+        last_login=Case(
+            *[When(pk=pk, then=Value(when)) for pk, when in pending.items()],
+            output_field=DateTimeField(),
+        )
+    )
+
+
+def flush():
+    """Write every pending timestamp now; returns the number of users written"""
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+    if not pending:
+        return 0
+    try:
+        return _write(pending)
+    except Exception as e:
+        logger.error(f"Error flushing {len(pending)} last_login updates: {str(e)}")
+        with _lock:
+            # Put them back for the next flush unless a newer login replaced them
+            for pk, when in pending.items():
+                if pk not in _pending or _pending[pk] < when:
+                    _pending[pk] = when
+        return 0
+
+
+def _run():
+    while True:
+        time.sleep(_setting('LAST_LOGIN_FLUSH_INTERVAL', 5))
+        flush()
+        close_old_connections()
+
+
+def _start_flusher():
+    global _flusher
+    if _flusher is not None:
+        return
+    with _lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_run, name='last-login-flusher', daemon=True)
+            _flusher.start()
+            atexit.register(flush)
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from AuthUser.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare logins per second in this process through the sync login view (WSGI handler, '
+        '--threads request threads; 1 = a sync worker) and the async one (ASGI handler, '
+        '--concurrency requests in flight on one event loop). Creates throwaway users in the '
+        'configured database and removes them afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=40, help='Logins per run')
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--threads', type=int, default=1, help='Threads for the sync run')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent requests for the async run')
+        parser.add_argument('--mode', choices=('both', 'sync', 'async'), default='both')
+
+    def handle(self, *args, **options):
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        if options['requests'] < 1 or options['users'] < 1:
+            raise CommandError('--requests and --users must be at least 1')
+
+        suffix = uuid.uuid4().hex[:8]
+        password = uuid.uuid4().hex
+        encoded = make_password(password)
+        users = User.objects.bulk_create(
+            User(username=f'bench-login-{suffix}-{index}', password=encoded) for index in range(options['users'])
+        )
+        usernames = [user.username for user in users]
+
+        throughput = {}
+        try:
+            if options['mode'] in ('both', 'sync'):
+                throughput['sync'] = self.report('sync', *self.run_sync(usernames, password, options))
+            if options['mode'] in ('both', 'async'):
+                throughput['async'] = self.report('async', *asyncio.run(self.run_async(usernames, password, options)))
+        finally:
+            User.objects.filter(username__startswith=f'bench-login-{suffix}-').delete()
+
+        if len(throughput) == 2:
+            self.stdout.write(f"async/sync logins per second: {throughput['async'] / throughput['sync']:.2f}x")
+
+    def report(self, mode, results, elapsed, requests):
+        self.stdout.write(f"{mode}:")
+        self.stdout.write(f"  logins:    {requests} in {elapsed:.2f}s ({requests / elapsed:.1f}/s)")
+        self.stdout.write(f"  responses: {dict(sorted(results.items()))}")
+        if set(results) != {200}:
+            raise CommandError(f'{mode} run had failed logins')
+        return requests / elapsed
+
+    def run_sync(self, usernames, password, options):
+        requests, threads = options['requests'], max(options['threads'], 1)
+        results = Counter()
+        lock = threading.Lock()
+
+        def worker(index):
+            client = Client(HTTP_HOST='localhost')
+            try:
+                for number in range(index, requests, threads):
+                    response = client.post('/api/auth/login/', {
+                        'username': usernames[number % len(usernames)],
+                        'password': password,
+                    }, content_type='application/json')
+                    with lock:
+                        results[response.status_code] += 1
+            finally:
+                connection.close()
+
+        pool = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+        started = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        return results, time.perf_counter() - started, requests
+
+    async def run_async(self, usernames, password, options):
+        requests = options['requests']
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(max(options['concurrency'], 1))
+        results = Counter()
+
+        async def login(number):
+            async with semaphore:
+                response = await client.post('/api/auth/async/login/', {
+                    'username': usernames[number % len(usernames)],
+                    'password': password,
+                }, content_type='application/json')
+                results[response.status_code] += 1
+
+        # AsyncClient always sends Host: testserver
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            started = time.perf_counter()
+            await asyncio.gather(*(login(number) for number in range(requests)))
+            elapsed = time.perf_counter() - started
+        return results, elapsed, requests
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from backend.db import delete_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired outstanding and blacklisted refresh tokens in batches '
+        '(run periodically, e.g. from cron)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--max-batches', type=int, default=0, help='Stop after this many batches (0 = no limit)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        now = timezone.now()
+
+        outstanding = blacklisted = batches = 0
+        while not options['max_batches'] or batches < options['max_batches']:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by('id')
+                .values_list('id', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                blacklisted_ids = list(BlacklistedToken.objects.filter(token_id__in=ids).values_list('id', flat=True))
+                blacklisted += delete_rows(BlacklistedToken, blacklisted_ids)
+                outstanding += delete_rows(OutstandingToken, ids)
+            batches += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {outstanding} expired outstanding tokens and {blacklisted} blacklist entries"
+        ))
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from .models import User
+from .tokens import FilteredRefreshToken
+from backend.serializers import DynamicFieldsModelSerializer
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -29,10 +32,14 @@ class UserLoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsModelSerializer):
     """Serializer for user data"""
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'phone_number', 'address', 'date_joined')
         read_only_fields = ('id', 'date_joined')
 
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh that checks the blacklist filter before the database"""
+    token_class = FilteredRefreshToken
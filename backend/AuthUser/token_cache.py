@@ -0,0 +1,78 @@
+"""
+In-process cache of verified access tokens.
+
+Verifying an access token means base64-decoding it, checking the HMAC
+signature and the claims. The same token arrives on every request for up to
+ACCESS_TOKEN_LIFETIME, so the validated token is kept in a bounded LRU keyed
+by the SHA-256 of the raw token and reused until the token's exp claim. The
+raw token itself is never stored as a key.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def _max_entries():
+    return getattr(settings, 'JWT_VERIFIED_CACHE_MAX_ENTRIES', 10000)
+
+
+def _digest(raw_token):
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode()
+    return hashlib.sha256(raw_token).digest()
+
+
+def get_or_validate(raw_token, validate):
+    """
+    Return the validated token for raw_token, calling validate(raw_token) on a
+    miss. Tokens without an exp claim are not cached.
+    """
+    max_entries = _max_entries()
+    if max_entries <= 0:
+        return validate(raw_token)
+
+    key = _digest(raw_token)
+    now = time.time()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                _entries.move_to_end(key)
+                _stats['hits'] += 1
+                return entry[1]
+            del _entries[key]
+        _stats['misses'] += 1
+
+    validated_token = validate(raw_token)
+    expires = validated_token.get('exp')
+    if expires is None or expires <= now:
+        return validated_token
+
+    with _lock:
+        _entries[key] = (expires, validated_token)
+        _entries.move_to_end(key)
+        while len(_entries) > max_entries:
+            _entries.popitem(last=False)
+            _stats['evictions'] += 1
+    return validated_token
+
+
+def stats():
+    """Hit/miss/eviction counters and current size of this process's cache"""
+    with _lock:
+        return {**_stats, 'size': len(_entries)}
+
+
+def clear():
+    """Drop all entries and reset the counters"""
+    with _lock:
+        _entries.clear()
+        for name in _stats:
+            _stats[name] = 0
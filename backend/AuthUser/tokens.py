@@ -0,0 +1,16 @@
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from . import blacklist
+
+
+class FilteredRefreshToken(RefreshToken):
+    """RefreshToken whose blacklist check consults the in-memory filter first"""
+
+    def check_blacklist(self):
+        if blacklist.might_be_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist.record(self.payload[api_settings.JTI_CLAIM])
+        return result
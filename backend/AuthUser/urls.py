@@ -1,6 +1,7 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 from .views import UserRegistrationView, UserLoginView, UserProfileView, UserLogoutView
+from .async_views import AsyncUserRegistrationView, AsyncUserLoginView
 
 app_name = 'authuser'
 
@@ -10,5 +11,8 @@ urlpatterns = [
     path('logout/', UserLogoutView.as_view(), name='logout'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('profile/', UserProfileView.as_view(), name='profile'),
+    # Async variants for ASGI deployments (backend/asgi.py)
+    path('async/register/', AsyncUserRegistrationView.as_view(), name='register-async'),
+    path('async/login/', AsyncUserLoginView.as_view(), name='login-async'),
 ]
 
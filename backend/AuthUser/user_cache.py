@@ -0,0 +1,80 @@
+"""
+Short-lived cache of the users resolved from access tokens.
+
+CookieJWTAuthentication looks the token's user up here instead of running a
+SELECT on auth_user for every request. Only a slim set of columns is cached;
+the user is rebuilt with the rest deferred, so touching another field loads it
+from the database on demand. Entries are dropped when a user is saved or
+deleted (which covers password and is_active changes) and expire after
+AUTH_USER_CACHE_TTL seconds, which bounds staleness for writes that bypass
+signals such as QuerySet.update(). Code that saves a user should save a fresh
+copy from the database rather than request.user.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+SLIM_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser',
+)
+REVOKE_HASH = '_revoke_hash'
+
+
+def get_ttl():
+    return getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+
+
+def cache_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def _build(values):
+    """Slim user instance from cached values; other fields load on access"""
+    user_model = get_user_model()
+    # from_db() expects the values in concrete field order
+    names = [field.attname for field in user_model._meta.concrete_fields if field.attname in SLIM_FIELDS]
+    user = user_model.from_db(router.db_for_read(user_model), names, [values[name] for name in names])
+    setattr(user, REVOKE_HASH, values.get(REVOKE_HASH))
+    return user
+
+
+def _load(user_id):
+    """Fetch the slim columns of user_id; returns the cacheable dict"""
+    user_model = get_user_model()
+    fields = SLIM_FIELDS + (('password',) if api_settings.CHECK_REVOKE_TOKEN else ())
+    values = user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values(*fields).first()
+    if values is None:
+        return None
+    if api_settings.CHECK_REVOKE_TOKEN:
+        # Keep a digest of the hash for the revoke check, never the hash itself
+        values[REVOKE_HASH] = get_md5_hash_password(values.pop('password'))
+    return values
+
+
+def get_user(user_id):
+    """Return the (slim) user with user_id, or None if there is none"""
+    ttl = get_ttl()
+    if ttl <= 0:
+        values = _load(user_id)
+        return _build(values) if values is not None else None
+
+    key = cache_key(user_id)
+    values = cache.get(key)
+    if values is None:
+        values = _load(user_id)
+        if values is None:
+            return None
+        cache.set(key, values, ttl)
+    return _build(values)
+
+
+def invalidate(user_id):
+    """Drop the cached user now and again once the current transaction commits"""
+    key = cache_key(user_id)
+    cache.delete(key)
+    # A request that read the row before the commit may have re-cached old values
+    transaction.on_commit(lambda: cache.delete(key))
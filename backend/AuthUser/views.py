@@ -5,11 +5,12 @@ from rest_framework.exceptions import ValidationError
 from django.contrib.auth import authenticate
 from django.db import IntegrityError
 from django.conf import settings
-from rest_framework_simplejwt.tokens import RefreshToken
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 import logging
 from .models import User
+from .tokens import FilteredRefreshToken
+from . import last_login
 from .serializers import UserRegistrationSerializer, UserSerializer, UserLoginSerializer
 
 logger = logging.getLogger(__name__)
@@ -60,7 +61,7 @@ class UserRegistrationView(generics.CreateAPIView):
             
             try:
                 # Generate JWT tokens
-                refresh = RefreshToken.for_user(user)
+                refresh = FilteredRefreshToken.for_user(user)
                 access_token = refresh.access_token
             except Exception as e:
                 logger.error(f"Error creating JWT tokens: {str(e)}")
@@ -143,9 +144,10 @@ class UserLoginView(generics.GenericAPIView):
                 return Response({'error': f'Authentication error occurred: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
             if user:
+                last_login.touch(user)
                 try:
                     # Generate JWT tokens
-                    refresh = RefreshToken.for_user(user)
+                    refresh = FilteredRefreshToken.for_user(user)
                     access_token = refresh.access_token
                     
                     # Create response with tokens in body
@@ -231,7 +233,8 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
             return Response({'error': 'Error updating user profile'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def get_object(self):
-        return self.request.user
+        # request.user may be a slim cached copy; edit the full row
+        return User.objects.get(pk=self.request.user.pk)
 
 
 class UserLogoutView(generics.GenericAPIView):
@@ -267,7 +270,7 @@ class UserLogoutView(generics.GenericAPIView):
             # Try to blacklist the refresh token if provided
             if refresh_token:
                 try:
-                    token = RefreshToken(refresh_token)
+                    token = FilteredRefreshToken(refresh_token)
                     token.blacklist()
                 except Exception as e:
                     error_msg = str(e)
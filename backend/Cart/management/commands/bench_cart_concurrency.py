@@ -0,0 +1,71 @@
+import threading
+import time
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from AuthUser.models import User
+from Products.models import Product
+from Cart.models import Cart
+
+
+class Command(BaseCommand):
+    help = (
+        'Stress cart quantity updates from many threads and verify that no update is lost. '
+        'Creates a throwaway user and product in the configured database and removes them afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--ops', type=int, default=200, help='Operations per thread')
+        parser.add_argument(
+            '--legacy', action='store_true',
+            help='Use the old read-modify-write save() path to compare against'
+        )
+
+    def handle(self, *args, **options):
+        threads, ops = options['threads'], options['ops']
+        suffix = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(username=f'bench-cart-{suffix}', password=uuid.uuid4().hex)
+        product = Product.objects.create(name=f'bench-cart-{suffix}', description='benchmark', price=1, is_available=False)
+        cart_item_id = Cart.objects.add_quantity(user, product, 1)
+        errors = []
+
+        def worker():
+            try:
+                for index in range(ops):
+                    if options['legacy']:
+                        cart_item = Cart.objects.get(pk=cart_item_id)
+                        cart_item.quantity += 1
+                        cart_item.save()
+                    elif index % 2:
+                        Cart.objects.add_quantity(user, product, 1)
+                    else:
+                        Cart.objects.increase_quantity(cart_item_id, user, 1)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        try:
+            expected = 1 + threads * ops
+            actual = Cart.objects.get(pk=cart_item_id).quantity
+            self.stdout.write(f"mode:        {'legacy save()' if options['legacy'] else 'atomic UPDATE'}")
+            self.stdout.write(f"operations:  {threads * ops} in {elapsed:.2f}s ({threads * ops / elapsed:.0f} ops/s)")
+            self.stdout.write(f"quantity:    {actual} (expected {expected}, lost {expected - actual})")
+            if errors:
+                self.stdout.write(self.style.WARNING(f"errors:      {len(errors)} (first: {errors[0]})"))
+        finally:
+            product.delete()
+            user.delete()
+
+        if actual != expected and not options['legacy']:
+            raise CommandError('Lost updates detected')
+        self.stdout.write(self.style.SUCCESS('Done'))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Cart', '0001_initial'),
+        ('Products', '0006_stock_shards'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='When the stock hold lapses', null=True),
+        ),
+        migrations.AddField(
+            model_name='cart',
+            name='reserved_quantity',
+            field=models.PositiveIntegerField(default=0, help_text='Units of stock held for this line until expires_at'),
+        ),
+        migrations.AddIndex(
+            model_name='cart',
+            index=models.Index(fields=['product', 'expires_at'], name='cart_product_hold_idx'),
+        ),
+    ]
@@ -1,7 +1,42 @@
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator
+from django.db.models import F
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
 from Products.models import Product
+from backend.db import upsert_add
+
+
+class CartManager(models.Manager):
+    """Cart quantity changes as single atomic statements"""
+
+    def add_quantity(self, user, product, quantity):
+        """Add quantity to the user's line for product, creating it if needed. Returns the line id."""
+        now = timezone.now()
+        return upsert_add(
+            self.model,
+            keys={'user_id': user.pk, 'product_id': product.pk},
+            increments={'quantity': quantity},
+            values={'updated_at': now},
+            insert_values={'created_at': now},
+        )
+
+    def increase_quantity(self, pk, user, quantity):
+        """Returns the number of updated rows (0 if the line does not exist)"""
+        return self.filter(pk=pk, user=user).update(
+            quantity=F('quantity') + quantity,
+            updated_at=timezone.now()
+        )
+
+    def decrease_quantity(self, pk, user, quantity):
+        """Decrease a line's quantity without going below 1; a stock hold shrinks with it"""
+        new_quantity = Greatest(F('quantity') - quantity, 1)
+        return self.filter(pk=pk, user=user).update(
+            quantity=new_quantity,
+            reserved_quantity=Least(F('reserved_quantity'), new_quantity),
+            updated_at=timezone.now()
+        )
 
 
 class Cart(models.Model):
@@ -9,14 +44,22 @@ class Cart(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='carts')
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='cart_items')
     quantity = models.IntegerField(default=1, validators=[MinValueValidator(1)])
+    reserved_quantity = models.PositiveIntegerField(default=0, help_text="Units of stock held for this line until expires_at")
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True, help_text="When the stock hold lapses")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CartManager()
+
     class Meta:
         db_table = 'cart'
         verbose_name = 'Cart'
         verbose_name_plural = 'Carts'
         unique_together = ['user', 'product']
+        indexes = [
+            # Active holds per product, for available-stock checks
+            models.Index(fields=['product', 'expires_at'], name='cart_product_hold_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.product.name}"
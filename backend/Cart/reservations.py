@@ -0,0 +1,113 @@
+"""
+Time-limited stock holds for cart lines.
+
+When CART_RESERVATION_TTL is set, adding to a cart line also holds its
+quantity for the user until expires_at. Holds are soft: product stock is not
+touched. Instead every availability check subtracts the active holds of other
+users, so a hold simply stops counting once it expires. The
+release_expired_cart_holds command clears expired holds in batches so the
+hold index stays small.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Now
+from django.utils import timezone
+from Products.models import Product
+from Products.inventory import InsufficientStock, shard_stock_total
+from .models import Cart
+
+
+def get_ttl():
+    return getattr(settings, 'CART_RESERVATION_TTL', 0)
+
+
+def is_enabled():
+    return get_ttl() > 0
+
+
+def held_quantity(product_ref, exclude_user=None):
+    """Units of product_ref held by active cart holds, as a subquery expression"""
+    holds = Cart.objects.filter(product_id=product_ref, reserved_quantity__gt=0, expires_at__gt=Now())
+    if exclude_user is not None:
+        holds = holds.exclude(user=exclude_user)
+    total = holds.order_by().values('product_id').annotate(total=Sum('reserved_quantity')).values('total')
+    return Coalesce(Subquery(total, output_field=IntegerField()), 0)
+
+
+def held_by_others(user):
+    """
+    reserve_stock() hook for user's orders: stock held in other carts is not
+    available. None when reservations are disabled.
+    """
+    if not is_enabled():
+        return None
+    return lambda product_ref: held_quantity(product_ref, exclude_user=user)
+
+
+def available_stock(product_ids, exclude_user=None):
+    """{product_id: row and shard stock minus active holds}, in one query"""
+    return dict(
+        Product.objects.filter(pk__in=product_ids)
+        .annotate(
+            available=F('stock') + shard_stock_total(OuterRef('pk')) - held_quantity(OuterRef('pk'), exclude_user)
+        )
+        .values_list('pk', 'available')
+    )
+
+
+def hold(user, product_ids):
+    """
+    Hold the full quantity of the user's cart lines for product_ids for
+    another TTL. Raises InsufficientStock, holding nothing, when the stock left
+    over by other users' holds cannot cover a line.
+    """
+    if not is_enabled() or not product_ids:
+        return
+    product_ids = sorted(set(product_ids))
+    expires_at = timezone.now() + timedelta(seconds=get_ttl())
+    with transaction.atomic():
+        if connection.features.has_select_for_update:
+            # Serialize with concurrent holds and orders on the same products
+            list(Product.objects.select_for_update().filter(pk__in=product_ids).order_by('pk').values_list('pk'))
+        try:
+            with transaction.atomic():
+                lines = Cart.objects.filter(user=user, product_id__in=product_ids)
+                # Row stock plus shard stock must cover the line and the other users' holds
+                updated = lines.filter(
+                    product__stock__gte=(
+                        F('quantity')
+                        + held_quantity(OuterRef('product_id'), exclude_user=user)
+                        - shard_stock_total(OuterRef('product_id'))
+                    )
+                ).update(reserved_quantity=F('quantity'), expires_at=expires_at)
+                if updated != lines.count():
+                    raise InsufficientStock(product_ids)
+        except InsufficientStock:
+            available = available_stock(product_ids, exclude_user=user)
+            lines = Cart.objects.filter(user=user, product_id__in=product_ids).values_list('product_id', 'quantity')
+            short = [product_id for product_id, quantity in lines if available.get(product_id, 0) < quantity]
+            raise InsufficientStock(short or product_ids)
+
+
+def release(user, product_ids):
+    """Drop the user's holds on product_ids"""
+    return Cart.objects.filter(user=user, product_id__in=product_ids, reserved_quantity__gt=0).update(
+        reserved_quantity=0, expires_at=None
+    )
+
+
+def release_expired(batch_size=1000):
+    """Clear expired holds in batches of set-based UPDATEs; returns the number cleared"""
+    released = 0
+    while True:
+        ids = list(
+            Cart.objects.filter(expires_at__lte=timezone.now())
+            .order_by('expires_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return released
+        released += Cart.objects.filter(id__in=ids).update(reserved_quantity=0, expires_at=None)
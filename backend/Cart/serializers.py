@@ -1,17 +1,20 @@
 from rest_framework import serializers
 from .models import Cart
 from Products.serializers import ProductSerializer
+from backend.serializers import DynamicFieldsModelSerializer
 
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(DynamicFieldsModelSerializer):
     """Serializer for Cart model"""
     product = ProductSerializer(read_only=True)
     total_price = serializers.ReadOnlyField()
 
     class Meta:
         model = Cart
-        fields = ('id', 'product', 'quantity', 'total_price', 'created_at', 'updated_at')
-        read_only_fields = ('id', 'created_at', 'updated_at')
+        fields = ('id', 'product', 'quantity', 'reserved_quantity', 'expires_at', 'total_price', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'reserved_quantity', 'expires_at', 'created_at', 'updated_at')
+        expandable_fields = ('product',)
+        property_sources = {'total_price': ('quantity', 'product__price')}
 
 
 class CartCreateSerializer(serializers.Serializer):
@@ -25,3 +28,32 @@ class CartQuantityUpdateSerializer(serializers.Serializer):
     action = serializers.ChoiceField(choices=['increase', 'decrease'], required=True)
     quantity = serializers.IntegerField(default=1, min_value=1)
 
+
+class CartBatchOperationSerializer(serializers.Serializer):
+    """Serializer for one operation of a batch cart update"""
+    product_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(required=False, min_value=0, help_text="Set the line to this quantity (0 removes it)")
+    delta = serializers.IntegerField(required=False, help_text="Add to (or subtract from) the current quantity")
+
+    def validate(self, attrs):
+        if ('quantity' in attrs) == ('delta' in attrs):
+            raise serializers.ValidationError('Provide exactly one of quantity or delta')
+        return attrs
+
+
+class CartSummaryLineSerializer(serializers.Serializer):
+    """Serializer for one line of the cart summary"""
+    id = serializers.IntegerField()
+    product_id = serializers.IntegerField()
+    product_name = serializers.CharField(source='product__name')
+    price = serializers.DecimalField(source='product__price', max_digits=10, decimal_places=2)
+    quantity = serializers.IntegerField()
+    line_total = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class CartSummarySerializer(serializers.Serializer):
+    """Serializer for the cart summary totals"""
+    items = CartSummaryLineSerializer(many=True)
+    line_count = serializers.IntegerField()
+    item_count = serializers.IntegerField()
+    grand_total = serializers.DecimalField(max_digits=12, decimal_places=2)
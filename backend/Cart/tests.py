@@ -1,3 +1,30 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from AuthUser.models import User
+from Products.inventory import shard_stock
+from Products.models import Product
+from .models import Cart
+from .reservations import available_stock
 
-# Create your tests here.
+
+@override_settings(CART_RESERVATION_TTL=600)
+class CartHoldTests(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(name='Lamp', description='d', price=10, stock=10)
+        shard_stock(self.product.id, 3)
+
+    def add(self, username, quantity):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username=username, password='x'))
+        return client.post('/api/cart/', {'product_id': self.product.id, 'quantity': quantity}, format='json')
+
+    def test_sharded_product_can_be_held(self):
+        response = self.add('first', 4)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Cart.objects.get().reserved_quantity, 4)
+        self.assertEqual(available_stock([self.product.id]), {self.product.id: 6})
+
+    def test_hold_counts_other_users_against_shard_stock(self):
+        self.assertEqual(self.add('first', 7).status_code, 201)
+        self.assertEqual(self.add('second', 4).status_code, 400)
+        self.assertEqual(self.add('third', 3).status_code, 201)
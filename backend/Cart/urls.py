@@ -1,10 +1,12 @@
 from django.urls import path
-from .views import CartListView, CartDetailView, CartQuantityUpdateView
+from .views import CartListView, CartDetailView, CartQuantityUpdateView, CartBatchView, CartSummaryView
 
 app_name = 'cart'
 
 urlpatterns = [
     path('', CartListView.as_view(), name='cart-list'),
+    path('summary/', CartSummaryView.as_view(), name='cart-summary'),
+    path('batch/', CartBatchView.as_view(), name='cart-batch'),
     path('<int:pk>/', CartDetailView.as_view(), name='cart-detail'),
     path('<int:pk>/quantity/', CartQuantityUpdateView.as_view(), name='cart-quantity-update'),
 ]
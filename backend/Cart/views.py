@@ -1,19 +1,28 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from django.db import IntegrityError, transaction
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 import logging
 from .models import Cart
-from .serializers import CartSerializer, CartCreateSerializer, CartQuantityUpdateSerializer
+from django.utils import timezone
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum, Window
+from .serializers import (
+    CartSerializer, CartCreateSerializer, CartQuantityUpdateSerializer, CartBatchOperationSerializer,
+    CartSummarySerializer,
+)
 from Products.models import Product
+from Products.inventory import InsufficientStock
+from . import reservations
+from backend.prefetch import AutoPrefetchMixin
 
 logger = logging.getLogger(__name__)
 
 
-class CartListView(generics.ListCreateAPIView):
+class CartListView(AutoPrefetchMixin, generics.ListCreateAPIView):
     """List user's cart items and add items to cart"""
     permission_classes = [IsAuthenticated]
 
@@ -36,7 +45,7 @@ class CartListView(generics.ListCreateAPIView):
             quantity = serializer.validated_data.get('quantity', 1)
 
             try:
-                product = Product.objects.get(id=product_id)
+                product = Product.objects.only('id').get(id=product_id)
             except Product.DoesNotExist:
                 return Response({'error': 'Product not found'}, status=status.HTTP_404_NOT_FOUND)
             except Exception as e:
@@ -45,17 +54,14 @@ class CartListView(generics.ListCreateAPIView):
 
             try:
                 with transaction.atomic():
-                    cart_item, created = Cart.objects.get_or_create(
-                        user=request.user,
-                        product=product,
-                        defaults={'quantity': quantity}
-                    )
-
-                    if not created:
-                        cart_item.quantity += quantity
-                        cart_item.save()
-
+                    # Single INSERT ... ON CONFLICT statement, safe against concurrent adds
+                    cart_item_id = Cart.objects.add_quantity(request.user, product, quantity)
+                    # Hold the line's stock when reservations are enabled; rolls the add back if it can't
+                    reservations.hold(request.user, [product_id])
+                cart_item = Cart.objects.select_related('product__category').get(pk=cart_item_id)
                 return Response(CartSerializer(cart_item).data, status=status.HTTP_201_CREATED)
+            except InsufficientStock:
+                return Response({'error': 'Insufficient stock'}, status=status.HTTP_400_BAD_REQUEST)
             except IntegrityError as e:
                 logger.error(f"Integrity error creating cart item: {str(e)}")
                 return Response({'error': 'Error adding item to cart'}, status=status.HTTP_400_BAD_REQUEST)
@@ -67,7 +73,7 @@ class CartListView(generics.ListCreateAPIView):
             return Response({'error': 'An unexpected error occurred'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class CartDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CartDetailView(AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific cart item"""
     serializer_class = CartSerializer
     permission_classes = [IsAuthenticated]
@@ -110,14 +116,6 @@ class CartQuantityUpdateView(generics.GenericAPIView):
     def patch(self, request, pk):
         """Update cart item quantity"""
         try:
-            try:
-                cart_item = Cart.objects.get(pk=pk, user=request.user)
-            except Cart.DoesNotExist:
-                return Response({'error': 'Cart item not found'}, status=status.HTTP_404_NOT_FOUND)
-            except Exception as e:
-                logger.error(f"Error fetching cart item: {str(e)}")
-                return Response({'error': 'Error fetching cart item'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
             serializer = self.get_serializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             
@@ -125,18 +123,174 @@ class CartQuantityUpdateView(generics.GenericAPIView):
             quantity = serializer.validated_data.get('quantity', 1)
             
             try:
-                if action == 'increase':
-                    cart_item.quantity += quantity
-                elif action == 'decrease':
-                    cart_item.quantity -= quantity
-                    if cart_item.quantity < 1:
-                        cart_item.quantity = 1
-                
-                cart_item.save()
+                # Conditional UPDATE; the decrease floor of 1 is applied in SQL
+                with transaction.atomic():
+                    if action == 'increase':
+                        updated = Cart.objects.increase_quantity(pk, request.user, quantity)
+                    else:
+                        updated = Cart.objects.decrease_quantity(pk, request.user, quantity)
+                    if not updated:
+                        return Response({'error': 'Cart item not found'}, status=status.HTTP_404_NOT_FOUND)
+                    if action == 'increase':
+                        reservations.hold(
+                            request.user, [Cart.objects.values_list('product_id', flat=True).get(pk=pk)]
+                        )
+
+                cart_item = Cart.objects.select_related('product__category').get(pk=pk)
                 return Response(CartSerializer(cart_item).data, status=status.HTTP_200_OK)
+            except InsufficientStock:
+                return Response({'error': 'Insufficient stock'}, status=status.HTTP_400_BAD_REQUEST)
             except Exception as e:
                 logger.error(f"Error updating cart item quantity: {str(e)}")
                 return Response({'error': 'Error updating cart item quantity'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         except Exception as e:
             logger.error(f"Unexpected error in cart quantity update: {str(e)}")
             return Response({'error': 'An unexpected error occurred'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class CartBatchView(generics.GenericAPIView):
+    """
+    Batch Cart Update
+
+    Apply a list of cart operations in one transaction.
+    Each operation is {product_id, quantity} to set a line or {product_id, delta}
+    to adjust it; lines that end at 0 or below are removed.
+    Returns the updated cart.
+    """
+    serializer_class = CartBatchOperationSerializer
+    permission_classes = [IsAuthenticated]
+    queryset = Cart.objects.none()  # For Swagger schema generation
+    max_operations = 100
+
+    @swagger_auto_schema(
+        operation_description="Apply several cart operations in one request",
+        request_body=CartBatchOperationSerializer(many=True),
+        responses={
+            200: openapi.Response('Cart updated successfully', CartSerializer(many=True)),
+            400: 'Bad request - validation error',
+            404: 'Product not found',
+            401: 'Authentication required'
+        }
+    )
+    def post(self, request):
+        """Apply batch cart operations"""
+        try:
+            serializer = CartBatchOperationSerializer(
+                data=request.data, many=True, allow_empty=False, max_length=self.max_operations
+            )
+            serializer.is_valid(raise_exception=True)
+            operations = serializer.validated_data
+
+            product_ids = {operation['product_id'] for operation in operations}
+            try:
+                found = set(Product.objects.filter(id__in=product_ids).values_list('id', flat=True))
+            except Exception as e:
+                logger.error(f"Error fetching products: {str(e)}")
+                return Response({'error': 'Error fetching products'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            missing = sorted(product_ids - found)
+            if missing:
+                return Response({'error': 'Product not found', 'product_ids': missing}, status=status.HTTP_404_NOT_FOUND)
+
+            try:
+                with transaction.atomic():
+                    quantities = dict(
+                        Cart.objects.select_for_update()
+                        .filter(user=request.user, product_id__in=product_ids)
+                        .values_list('product_id', 'quantity')
+                    )
+                    previous = dict(quantities)
+                    for operation in operations:
+                        product_id = operation['product_id']
+                        if 'quantity' in operation:
+                            quantities[product_id] = operation['quantity']
+                        else:
+                            quantities[product_id] = quantities.get(product_id, 0) + operation['delta']
+
+                    now = timezone.now()
+                    Cart.objects.bulk_create(
+                        [
+                            Cart(user=request.user, product_id=product_id, quantity=quantity,
+                                 created_at=now, updated_at=now)
+                            for product_id, quantity in quantities.items() if quantity > 0
+                        ],
+                        update_conflicts=True,
+                        unique_fields=['user', 'product'],
+                        update_fields=['quantity', 'updated_at'],
+                    )
+                    removed = [product_id for product_id, quantity in quantities.items() if quantity <= 0]
+                    if removed:
+                        Cart.objects.filter(user=request.user, product_id__in=removed).delete()
+                    # Lines that grew need a bigger hold; lines that shrank keep at most their quantity
+                    reservations.hold(request.user, [
+                        product_id for product_id, quantity in quantities.items()
+                        if quantity > previous.get(product_id, 0)
+                    ])
+                    Cart.objects.filter(user=request.user, reserved_quantity__gt=F('quantity')).update(
+                        reserved_quantity=F('quantity')
+                    )
+            except InsufficientStock as e:
+                return Response({'error': 'Insufficient stock', 'product_ids': e.product_ids}, status=status.HTTP_400_BAD_REQUEST)
+            except IntegrityError as e:
+                logger.error(f"Integrity error applying cart batch: {str(e)}")
+                return Response({'error': 'Error updating cart'}, status=status.HTTP_400_BAD_REQUEST)
+            except Exception as e:
+                logger.error(f"Error applying cart batch: {str(e)}")
+                return Response({'error': 'Error updating cart'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            cart_items = Cart.objects.filter(user=request.user).select_related('product__category')
+            return Response(CartSerializer(cart_items, many=True).data, status=status.HTTP_200_OK)
+        except ValidationError as e:
+            return Response({'error': e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Unexpected error in cart batch update: {str(e)}")
+            return Response({'error': 'An unexpected error occurred'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class CartSummaryView(generics.GenericAPIView):
+    """
+    Cart Summary
+
+    Line totals, item count and grand total for the user's cart,
+    computed by the database in a single query.
+    """
+    serializer_class = CartSummarySerializer
+    permission_classes = [IsAuthenticated]
+    queryset = Cart.objects.none()  # For Swagger schema generation
+
+    @swagger_auto_schema(
+        operation_description="Get cart line totals and grand total",
+        responses={
+            200: CartSummarySerializer,
+            401: 'Authentication required'
+        }
+    )
+    def get(self, request):
+        """Get cart summary"""
+        try:
+            line_total = ExpressionWrapper(
+                F('quantity') * F('product__price'),
+                output_field=DecimalField(max_digits=12, decimal_places=2)
+            )
+            # Window aggregates attach the cart-wide totals to every line,
+            # so lines and totals come back from one query
+            lines = list(
+                Cart.objects.filter(user=request.user)
+                .annotate(
+                    line_total=line_total,
+                    item_count=Window(Sum('quantity')),
+                    grand_total=Window(Sum(line_total)),
+                )
+                .order_by('id')
+                .values('id', 'product_id', 'product__name', 'product__price', 'quantity',
+                        'line_total', 'item_count', 'grand_total')
+            )
+            summary = {
+                'items': lines,
+                'line_count': len(lines),
+                'item_count': lines[0]['item_count'] if lines else 0,
+                'grand_total': lines[0]['grand_total'] if lines else 0,
+            }
+            return Response(CartSummarySerializer(summary).data, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error(f"Error building cart summary: {str(e)}")
+            return Response({'error': 'Error building cart summary'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
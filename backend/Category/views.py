@@ -4,11 +4,12 @@ from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 import logging
 from .models import Category
 from .serializers import CategorySerializer
+from backend.prefetch import AutoPrefetchMixin
 
 logger = logging.getLogger(__name__)
 
 
-class CategoryListView(generics.ListCreateAPIView):
+class CategoryListView(AutoPrefetchMixin, generics.ListCreateAPIView):
     """List all categories and create new category (admin only)"""
     queryset = Category.objects.filter(is_active=True)
     serializer_class = CategorySerializer
@@ -26,7 +27,7 @@ class CategoryListView(generics.ListCreateAPIView):
         return Category.objects.all()
 
 
-class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CategoryDetailView(AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific category"""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
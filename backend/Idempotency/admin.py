@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import IdempotencyKey
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'key', 'status', 'response_status', 'locked_until', 'created_at', 'expires_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('key', 'user__username')
+    readonly_fields = ('created_at',)
@@ -0,0 +1,161 @@
+"""
+Idempotency-Key support for POST endpoints.
+
+A client that retries a POST sends the same Idempotency-Key header. The first
+request claims the key (a unique row per user and key) and its response is
+stored with a hash of the request. A retry with the same key and body gets
+the stored response back without running the view again. A retry that
+arrives while the first request is still running waits for it, and one with
+a different body is rejected with 422.
+
+The view runs in one transaction with the write that stores its response, so
+either both are committed or neither is. A processing key carries a lease
+(IDEMPOTENCY_LOCK_TIMEOUT); if the request holding it died, a retry with the
+same body takes the key over once the lease has run out.
+"""
+import functools
+import hashlib
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request):
+    """SHA-256 over method, path and the canonical JSON of the body"""
+    body = json.dumps(request.data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(f"{request.method}\n{request.path}\n{body}".encode()).hexdigest()
+
+
+def _lease_end():
+    return timezone.now() + timedelta(seconds=getattr(settings, 'IDEMPOTENCY_LOCK_TIMEOUT', 60))
+
+
+def _claim(user, key, request_hash):
+    """Insert the processing row; returns it, or None when the key is already taken"""
+    ttl = getattr(settings, 'IDEMPOTENCY_KEY_TTL', 24 * 60 * 60)
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                user=user,
+                key=key,
+                request_hash=request_hash,
+                locked_until=_lease_end(),
+                expires_at=timezone.now() + timedelta(seconds=ttl)
+            )
+    except IntegrityError:
+        return None
+
+
+def _take_over(record):
+    """Renew the lease of a processing row whose lease ran out; returns it, or None if another request won"""
+    locked_until = _lease_end()
+    taken = IdempotencyKey.objects.filter(
+        pk=record.pk, status='processing', locked_until=record.locked_until, locked_until__lte=timezone.now()
+    ).update(locked_until=locked_until)
+    if not taken:
+        return None
+    record.locked_until = locked_until
+    return record
+
+
+def _wait_for(user, key, request_hash):
+    """
+    Poll until the first request with this key finishes or its lease runs
+    out. Returns its record, or None if it failed and released the key.
+    """
+    deadline = time.monotonic() + getattr(settings, 'IDEMPOTENCY_WAIT_TIMEOUT', 10)
+    interval = 0.05
+    while True:
+        record = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if record is None or record.status == 'completed' or record.request_hash != request_hash:
+            return record
+        if record.locked_until <= timezone.now():
+            return record
+        if time.monotonic() >= deadline:
+            return record
+        time.sleep(interval)
+        interval = min(interval * 2, 0.5)
+
+
+def _replay(record):
+    response = Response(record.response_body, status=record.response_status)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view_method):
+    """
+    Make a POST handler (APIView.post or a generic view's create) honour the
+    Idempotency-Key header. Requests without the header run as before.
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        user = request.user
+        request_hash = request_fingerprint(request)
+        record = _claim(user, key, request_hash)
+        if record is None and IdempotencyKey.objects.filter(
+            user=user, key=key, expires_at__lte=timezone.now()
+        ).delete()[0]:
+            # The key had expired and can be reused
+            record = _claim(user, key, request_hash)
+
+        if record is None:
+            existing = _wait_for(user, key, request_hash)
+            if existing is not None and existing.status != 'completed' and existing.request_hash == request_hash:
+                # The request holding the key stopped renewing its lease (e.g. the worker died)
+                record = _take_over(existing)
+
+        if record is None:
+            if existing is None:
+                return Response({'error': 'The original request with this Idempotency-Key failed; retry'},
+                                status=status.HTTP_409_CONFLICT)
+            if existing.request_hash != request_hash:
+                return Response({'error': f'{HEADER} was already used for a different request'},
+                                status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            if existing.status != 'completed':
+                return Response({'error': 'A request with this Idempotency-Key is still in progress'},
+                                status=status.HTTP_409_CONFLICT)
+            return _replay(existing)
+
+        try:
+            with transaction.atomic():
+                # Renewing the lease first also takes the write lock up front on SQLite
+                IdempotencyKey.objects.filter(pk=record.pk).update(locked_until=_lease_end())
+                response = view_method(self, request, *args, **kwargs)
+                final = response.status_code < 500 and response.status_code != status.HTTP_429_TOO_MANY_REQUESTS
+                if final:
+                    record.status = 'completed'
+                    record.response_status = response.status_code
+                    record.response_body = response.data
+                    record.save(update_fields=['status', 'response_status', 'response_body'])
+                else:
+                    # Server errors and "retry later" are not final; undo any partial writes
+                    transaction.set_rollback(True)
+        except Exception:
+            record.delete()
+            raise
+
+        if not final:
+            # Let the client retry with the same key
+            record.delete()
+        return response
+
+    return wrapper
+
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Idempotency', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='locked_until',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='A processing key left past this time can be taken over by a retry'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from AuthUser.models import User
+from Order.models import Order
+from Products.models import Product
+from .decorators import request_fingerprint
+from .models import IdempotencyKey
+
+
+@override_settings(CHECKOUT_ADMISSION_ENABLED=False, IDEMPOTENCY_WAIT_TIMEOUT=0)
+class IdempotentOrderTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='buyer', password='x')
+        self.product = Product.objects.create(name='Lamp', description='d', price=10, stock=5)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.body = {'product_id': self.product.id, 'quantity': 1, 'shipping_address': 'Street 1'}
+
+    def post(self, key='key-1'):
+        return self.client.post('/api/orders/', self.body, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def processing_row(self, locked_until):
+        request = type('Request', (), {'method': 'POST', 'path': '/api/orders/', 'data': self.body})
+        return IdempotencyKey.objects.create(
+            user=self.user, key='key-1', request_hash=request_fingerprint(request),
+            locked_until=locked_until, expires_at=timezone.now() + timedelta(days=1)
+        )
+
+    def test_retry_replays_stored_response(self):
+        first = self.post()
+        second = self.post()
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_live_processing_key_conflicts(self):
+        self.processing_row(timezone.now() + timedelta(minutes=1))
+        self.assertEqual(self.post().status_code, 409)
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_stale_processing_key_is_taken_over(self):
+        self.processing_row(timezone.now() - timedelta(seconds=1))
+        response = self.post()
+        self.assertEqual(response.status_code, 201)
+        record = IdempotencyKey.objects.get(user=self.user, key='key-1')
+        self.assertEqual((record.status, record.response_status), ('completed', 201))
+        self.assertEqual(Order.objects.count(), 1)
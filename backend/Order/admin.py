@@ -1,3 +1,10 @@
 from django.contrib import admin
+from .models import ArchivedOrder
 
-# Register your models here.
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'product', 'quantity', 'total_price', 'status', 'created_at', 'archived_at')
+    list_filter = ('status', 'created_at', 'archived_at')
+    search_fields = ('id', 'user__username', 'product__name')
+    readonly_fields = ('archived_at',)
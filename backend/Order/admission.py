@@ -0,0 +1,146 @@
+"""
+Admission control in front of order creation.
+
+During a flash sale most checkout requests are doomed: there is only so much
+stock. Before touching the database for real, each request takes checkout
+tokens for the units it wants from a counter in the Django cache. A product
+hands out at most as many tokens as its remaining stock (and never more than
+CHECKOUT_ADMISSION_MAX_IN_FLIGHT, though a single line larger than that is
+still admitted when it has the product to itself), so surplus requests are turned away with
+429 and a queue position, and requests for a sold-out product are rejected
+from the cached stock snapshot without a query.
+
+The counters live in the default cache; point CACHES at a shared backend so
+every worker process sees the same counts. The database's conditional UPDATE
+stays the authoritative stock check.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from Products.inventory import total_stock
+
+STOCK_KEY = 'checkout-admission:stock:{}'
+IN_FLIGHT_KEY = 'checkout-admission:in-flight:{}'
+
+
+class SoldOut(Exception):
+    """The cached stock snapshot cannot cover the request"""
+
+    def __init__(self, product_ids):
+        self.product_ids = sorted(product_ids)
+        super().__init__(f"Sold out: products {self.product_ids}")
+
+
+class QueueFull(Exception):
+    """Every checkout token for a product is taken"""
+
+    def __init__(self, product_id, queue_position):
+        self.product_id = product_id
+        self.queue_position = queue_position
+        self.retry_after = getattr(settings, 'CHECKOUT_ADMISSION_RETRY_AFTER', 1)
+        super().__init__(f"Checkout queue full for product {product_id} (position {queue_position})")
+
+
+def is_enabled():
+    return getattr(settings, 'CHECKOUT_ADMISSION_ENABLED', True)
+
+
+def _stock_snapshot(product_id):
+    """Remaining stock, refreshed from the database at most once per snapshot TTL"""
+    key = STOCK_KEY.format(product_id)
+    stock = cache.get(key)
+    if stock is None:
+        try:
+            stock = total_stock(product_id)
+        except Exception:
+            # Unknown product: let the view produce its usual 404
+            return None
+        cache.set(key, stock, getattr(settings, 'CHECKOUT_ADMISSION_SNAPSHOT_TTL', 2))
+    return stock
+
+
+def _take(key, amount):
+    # add() is a no-op when the counter exists; the timeout reclaims tokens
+    # leaked by a worker that died mid-request
+    cache.add(key, 0, getattr(settings, 'CHECKOUT_ADMISSION_TOKEN_TTL', 60))
+    try:
+        return cache.incr(key, amount)
+    except ValueError:
+        # The counter expired between add() and incr()
+        cache.set(key, amount, getattr(settings, 'CHECKOUT_ADMISSION_TOKEN_TTL', 60))
+        return amount
+
+
+def _give_back(key, amount):
+    try:
+        cache.decr(key, amount)
+    except ValueError:
+        pass
+
+
+class CheckoutTicket:
+    """Checkout tokens held by one request; use as a context manager"""
+
+    def __init__(self, quantities):
+        self.quantities = quantities
+        self.held = {}
+
+    def acquire(self):
+        if not is_enabled():
+            return self
+        limit = getattr(settings, 'CHECKOUT_ADMISSION_MAX_IN_FLIGHT', 100)
+        sold_out = []
+        try:
+            for product_id in sorted(self.quantities):
+                quantity = self.quantities[product_id]
+                stock = _stock_snapshot(product_id)
+                if stock is None:
+                    continue
+                if stock < quantity:
+                    sold_out.append(product_id)
+                    continue
+                key = IN_FLIGHT_KEY.format(product_id)
+                in_flight = _take(key, quantity)
+                self.held[product_id] = quantity
+                # A line bigger than the limit must still fit on its own
+                capacity = min(stock, max(limit, quantity))
+                if in_flight > capacity:
+                    raise QueueFull(product_id, in_flight - capacity)
+            if sold_out:
+                raise SoldOut(sold_out)
+        except Exception:
+            self.release()
+            raise
+        return self
+
+    def consumed(self):
+        """Knock the ordered units off the stock snapshots once the order commits"""
+        held = dict(self.held)
+
+        def apply():
+            for product_id, quantity in held.items():
+                _give_back(STOCK_KEY.format(product_id), quantity)
+
+        transaction.on_commit(apply)
+
+    def sold_out(self, product_ids):
+        """Drop the snapshots of products the database reported short"""
+        cache.delete_many([STOCK_KEY.format(product_id) for product_id in product_ids])
+
+    def release(self):
+        for product_id, quantity in self.held.items():
+            _give_back(IN_FLIGHT_KEY.format(product_id), quantity)
+        self.held = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+        return False
+
+
+def admit(quantities):
+    """Take checkout tokens for {product_id: quantity}; raises SoldOut or QueueFull"""
+    return CheckoutTicket(quantities).acquire()
+
@@ -0,0 +1,41 @@
+"""
+Moving finished orders out of the hot order table.
+
+Delivered and cancelled orders older than a cutoff are copied to
+order_archive, together with their payments (payment_archive), and then
+deleted from the live tables. Each batch is one short transaction. Rows keep
+their ids, so links and reports stay valid. The daily sales rollups are left
+alone because they already count these orders.
+"""
+from django.db import transaction
+from backend.db import delete_rows
+from Payment.models import Payment, ArchivedPayment
+from .models import Order, ArchivedOrder
+
+ARCHIVABLE_STATUSES = ('delivered', 'cancelled')
+
+
+def _attnames(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def archive_batch(cutoff, batch_size=500, statuses=ARCHIVABLE_STATUSES):
+    """Archive up to batch_size orders created before cutoff; returns (orders, payments) moved"""
+    with transaction.atomic():
+        orders = list(
+            Order.objects.select_for_update()
+            .filter(created_at__lt=cutoff, status__in=statuses)
+            .order_by('created_at', 'id')
+            .values(*_attnames(Order))[:batch_size]
+        )
+        if not orders:
+            return 0, 0
+        order_ids = [row['id'] for row in orders]
+        payments = list(Payment.objects.select_for_update().filter(order_id__in=order_ids).values(*_attnames(Payment)))
+
+        ArchivedOrder.objects.bulk_create([ArchivedOrder(**row) for row in orders])
+        ArchivedPayment.objects.bulk_create([ArchivedPayment(**row) for row in payments])
+        # Raw deletes: no post_delete signals, so the sales rollups keep these rows
+        delete_rows(Payment, [row['id'] for row in payments])
+        delete_rows(Order, order_ids)
+    return len(orders), len(payments)
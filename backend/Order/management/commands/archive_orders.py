@@ -0,0 +1,34 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from Order.archive import archive_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Move delivered and cancelled orders (and their payments) older than --older-than days '
+        'to the archive tables, one bounded transaction per batch'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, required=True, help='Age in days')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--max-batches', type=int, default=0, help='Stop after this many batches (0 = no limit)')
+
+    def handle(self, *args, **options):
+        if options['older_than'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--older-than must be 0 or more and --batch-size at least 1')
+        cutoff = timezone.now() - timedelta(days=options['older_than'])
+
+        total_orders = total_payments = batches = 0
+        while not options['max_batches'] or batches < options['max_batches']:
+            orders, payments = archive_batch(cutoff, batch_size=options['batch_size'])
+            if not orders:
+                break
+            total_orders += orders
+            total_payments += payments
+            batches += 1
+            self.stdout.write(f"Batch {batches}: {orders} orders, {payments} payments")
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {total_orders} orders and {total_payments} payments created before {cutoff:%Y-%m-%d %H:%M}"
+        ))
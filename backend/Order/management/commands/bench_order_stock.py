@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIClient
+from AuthUser.models import User
+from Products.models import Product
+from Products.inventory import shard_stock, total_stock
+from Order.models import Order
+
+
+class Command(BaseCommand):
+    help = (
+        'Hammer POST /api/orders/ for a single product from many threads and verify that stock '
+        'is never oversold. Creates a throwaway user and product in the configured database and '
+        'removes them afterwards. Use --shards to spread the stock over counter rows and '
+        '--compare to run with and without sharding back to back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=50, help='Orders attempted per thread')
+        parser.add_argument('--stock', type=int, default=200)
+        parser.add_argument('--quantity', type=int, default=1, help='Quantity per order')
+        parser.add_argument('--shards', type=int, default=0, help='Stock shards for the product (0 = not sharded)')
+        parser.add_argument('--compare', action='store_true', help='Run unsharded and sharded (--shards, default 8)')
+
+    def handle(self, *args, **options):
+        # Rejected orders are expected; keep 4xx warnings out of the report
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+
+        if options['compare']:
+            runs = [0, options['shards'] or 8]
+        else:
+            runs = [options['shards']]
+
+        throughput = {}
+        for shards in runs:
+            throughput[shards] = self.run(shards, options)
+
+        if len(runs) == 2:
+            baseline, sharded = throughput[runs[0]], throughput[runs[1]]
+            self.stdout.write(f"sharded/unsharded throughput: {sharded / baseline:.2f}x")
+
+    def run(self, shards, options):
+        threads, per_thread = options['threads'], options['requests']
+        initial_stock, quantity = options['stock'], options['quantity']
+        suffix = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(username=f'bench-order-{suffix}', password=uuid.uuid4().hex)
+        product = Product.objects.create(
+            name=f'bench-order-{suffix}', description='benchmark', price=1, stock=initial_stock, is_available=False
+        )
+        if shards:
+            shard_stock(product.id, shards)
+        results = Counter()
+        lock = threading.Lock()
+
+        def worker():
+            client = APIClient(HTTP_HOST='localhost')
+            client.force_authenticate(user)
+            try:
+                for _ in range(per_thread):
+                    response = client.post('/api/orders/', {
+                        'product_id': product.id,
+                        'quantity': quantity,
+                        'shipping_address': 'benchmark',
+                    }, format='json')
+                    with lock:
+                        results[response.status_code] += 1
+            finally:
+                connection.close()
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        try:
+            remaining = total_stock(product.id)
+            ordered = sum(Order.objects.filter(product=product).values_list('quantity', flat=True))
+            attempts = threads * per_thread
+            self.stdout.write(f"shards:      {shards}")
+            self.stdout.write(f"requests:    {attempts} in {elapsed:.2f}s ({attempts / elapsed:.0f} req/s)")
+            self.stdout.write(f"responses:   {dict(sorted(results.items()))}")
+            self.stdout.write(f"stock:       {remaining} (initial {initial_stock}, ordered {ordered})")
+            consistent = remaining >= 0 and remaining + ordered == initial_stock
+        finally:
+            Order.objects.filter(product=product).delete()
+            product.delete()
+            user.delete()
+
+        if not consistent:
+            raise CommandError('Stock is inconsistent with the orders placed')
+        self.stdout.write(self.style.SUCCESS('Stock is exact - no oversell'))
+        return attempts / elapsed
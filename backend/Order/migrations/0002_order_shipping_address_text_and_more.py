@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Address', '0001_initial'),
+        ('Order', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='shipping_address_text',
+            field=models.TextField(blank=True, help_text='Fallback text address if Address model is not used', null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='shipping_address',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='Address.address'),
+        ),
+    ]
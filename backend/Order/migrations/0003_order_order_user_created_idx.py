@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Address', '0001_initial'),
+        ('Order', '0002_order_shipping_address_text_and_more'),
+        ('Products', '0002_product_category'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='order_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Address', '0001_initial'),
+        ('Order', '0003_order_order_user_created_idx'),
+        ('Products', '0006_stock_shards'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at', 'id'], name='order_created_idx'),
+        ),
+    ]
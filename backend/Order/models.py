@@ -29,6 +29,43 @@ class Order(models.Model):
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination seeks on (created_at, id) within a user's orders
+            models.Index(fields=['user', '-created_at', '-id'], name='order_user_created_idx'),
+            # Admin exports and reports scan a created_at range across all users
+            models.Index(fields=['created_at', 'id'], name='order_created_idx'),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} - {self.user.username}"
+
+
+class ArchivedOrder(models.Model):
+    """
+    Delivered or cancelled order moved out of the order table by
+    `manage.py archive_orders`. Keeps the original id and timestamps.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_orders')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='archived_orders')
+    quantity = models.IntegerField()
+    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    shipping_address = models.ForeignKey('Address.Address', on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_orders')
+    shipping_address_text = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'order_archive'
+        verbose_name = 'Archived Order'
+        verbose_name_plural = 'Archived Orders'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='order_archive_user_idx'),
+            models.Index(fields=['created_at', 'id'], name='order_archive_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived order #{self.id} - {self.user.username}"
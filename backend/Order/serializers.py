@@ -2,9 +2,10 @@ from rest_framework import serializers
 from .models import Order
 from Products.serializers import ProductSerializer
 from Address.serializers import AddressSerializer
+from backend.serializers import DynamicFieldsModelSerializer
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(DynamicFieldsModelSerializer):
     """Serializer for Order model"""
     product = ProductSerializer(read_only=True)
     shipping_address_obj = AddressSerializer(source='shipping_address', read_only=True)
@@ -15,6 +16,7 @@ class OrderSerializer(serializers.ModelSerializer):
                  'shipping_address', 'shipping_address_obj', 'shipping_address_text', 
                  'created_at', 'updated_at')
         read_only_fields = ('id', 'user', 'created_at', 'updated_at')
+        expandable_fields = ('product', 'shipping_address_obj')
 
 
 class OrderCreateSerializer(serializers.Serializer):
@@ -24,3 +26,23 @@ class OrderCreateSerializer(serializers.Serializer):
     shipping_address_id = serializers.IntegerField(required=False, allow_null=True, help_text="ID of saved address from Address model")
     shipping_address = serializers.CharField(required=False, allow_blank=True, help_text="Text address (used if shipping_address_id is not provided)")
 
+
+class OrderCheckoutSerializer(serializers.Serializer):
+    """Serializer for checking out the whole cart"""
+    shipping_address_id = serializers.IntegerField(required=False, allow_null=True, help_text="ID of saved address from Address model")
+    shipping_address = serializers.CharField(required=False, allow_blank=True, help_text="Text address (used if shipping_address_id is not provided)")
+
+
+class OrderHistorySerializer(serializers.Serializer):
+    """Serializer for a live or archived order in the order history"""
+    id = serializers.IntegerField()
+    product_id = serializers.IntegerField()
+    product_name = serializers.CharField(source='product__name')
+    quantity = serializers.IntegerField()
+    total_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    status = serializers.CharField()
+    shipping_address_id = serializers.IntegerField(allow_null=True)
+    shipping_address_text = serializers.CharField(allow_null=True)
+    created_at = serializers.DateTimeField()
+    updated_at = serializers.DateTimeField()
+    archived = serializers.BooleanField()
@@ -1,3 +1,65 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from AuthUser.models import User
+from Products.inventory import shard_stock, total_stock
+from Products.models import Product
+from .admission import STOCK_KEY, QueueFull, admit
 
-# Create your tests here.
+
+@override_settings(CHECKOUT_ADMISSION_ENABLED=True, CHECKOUT_ADMISSION_MAX_IN_FLIGHT=100)
+class CheckoutAdmissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.product = Product.objects.create(name='Crate', description='d', price=5, stock=500)
+
+    def test_line_above_limit_is_admitted_alone(self):
+        with admit({self.product.pk: 250}) as ticket:
+            self.assertEqual(ticket.held, {self.product.pk: 250})
+
+    def test_line_above_limit_waits_for_others(self):
+        with admit({self.product.pk: 10}):
+            with self.assertRaises(QueueFull):
+                admit({self.product.pk: 250})
+
+    def test_snapshot_lowered_only_on_commit(self):
+        key = STOCK_KEY.format(self.product.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            with admit({self.product.pk: 5}) as ticket:
+                ticket.consumed()
+            self.assertEqual(cache.get(key), 500)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(cache.get(key), 495)
+
+    def test_small_lines_capped_by_limit(self):
+        with admit({self.product.pk: 60}):
+            with self.assertRaises(QueueFull):
+                admit({self.product.pk: 60})
+
+
+@override_settings(CHECKOUT_ADMISSION_ENABLED=False)
+class OrderStockResponseTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='buyer', password='x'))
+
+    def order(self, product):
+        return self.client.post(
+            '/api/orders/', {'product_id': product.id, 'quantity': 1, 'shipping_address': 'Street 1'}, format='json'
+        )
+
+    def test_response_shows_remaining_stock(self):
+        product = Product.objects.create(name='Lamp', description='d', price=10, stock=10)
+        response = self.order(product)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['product']['stock'], response.data['product']['total_stock']), (9, 9))
+
+    def test_response_shows_remaining_sharded_stock(self):
+        product = Product.objects.create(name='Lamp', description='d', price=10, stock=10)
+        shard_stock(product.id, 3)
+        response = self.order(product)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['product']['stock'], 0)
+        self.assertEqual(response.data['product']['total_stock'], 9)
+        self.assertEqual(total_stock(product.id), 9)
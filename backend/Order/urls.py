@@ -1,10 +1,13 @@
 from django.urls import path
-from .views import OrderListView, OrderDetailView
+from .views import OrderListView, OrderDetailView, OrderCheckoutView, OrderExportView, OrderHistoryView
 
 app_name = 'order'
 
 urlpatterns = [
     path('', OrderListView.as_view(), name='order-list'),
+    path('checkout/', OrderCheckoutView.as_view(), name='order-checkout'),
+    path('export/', OrderExportView.as_view(), name='order-export'),
+    path('history/', OrderHistoryView.as_view(), name='order-history'),
     path('<int:pk>/', OrderDetailView.as_view(), name='order-detail'),
 ]
 
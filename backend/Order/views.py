@@ -1,17 +1,63 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.exceptions import ValidationError
 from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Value
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
 import logging
-from .models import Order
-from .serializers import OrderSerializer, OrderCreateSerializer
+from .models import Order, ArchivedOrder
+from .serializers import OrderSerializer, OrderCreateSerializer, OrderCheckoutSerializer, OrderHistorySerializer
 from Products.models import Product
+from Products.inventory import reserve_stock, InsufficientStock
+from .admission import admit, SoldOut, QueueFull
 from Address.models import Address
+from Cart.models import Cart
+from Cart.reservations import held_by_others, release as release_holds
+from backend.pagination import KeysetPaginationMixin
+from backend.export import stream_export, filter_date_range, InvalidExportParameter
+from Idempotency.decorators import idempotent
+from Outbox.events import publish, publish_many
+from Report.rollups import record_orders
+from backend.prefetch import AutoPrefetchMixin
 
 logger = logging.getLogger(__name__)
 
 
-class OrderListView(generics.ListCreateAPIView):
+def resolve_shipping_address(user, shipping_address_id, shipping_address_text):
+    """Return (address, error_response) for a saved address id or a text address"""
+    if shipping_address_id:
+        try:
+            return Address.objects.get(id=shipping_address_id, user=user), None
+        except Address.DoesNotExist:
+            return None, Response({'error': 'Shipping address not found'}, status=status.HTTP_404_NOT_FOUND)
+    if not shipping_address_text:
+        return None, Response({'error': 'Either shipping_address_id or shipping_address is required'}, status=status.HTTP_400_BAD_REQUEST)
+    return None, None
+
+
+def order_event(order):
+    """Outbox payload for an order.created event"""
+    return {
+        'order_id': order.id,
+        'user_id': order.user_id,
+        'product_id': order.product_id,
+        'quantity': order.quantity,
+        'total_price': order.total_price,
+    }
+
+
+def queue_full_response(error):
+    """429 telling the client where it stands in the checkout queue and when to retry"""
+    return Response(
+        {'error': 'Checkout is busy, please retry', 'queue_position': error.queue_position},
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={'Retry-After': str(error.retry_after)}
+    )
+
+
+class OrderListView(AutoPrefetchMixin, KeysetPaginationMixin, generics.ListCreateAPIView):
     """List user's orders and create new orders"""
     permission_classes = [IsAuthenticated]
 
@@ -26,6 +72,7 @@ class OrderListView(generics.ListCreateAPIView):
             return OrderCreateSerializer
         return OrderSerializer
 
+    @idempotent
     def create(self, request, *args, **kwargs):
         try:
             serializer = OrderCreateSerializer(data=request.data)
@@ -35,56 +82,274 @@ class OrderListView(generics.ListCreateAPIView):
             shipping_address_id = serializer.validated_data.get('shipping_address_id')
             shipping_address_text = serializer.validated_data.get('shipping_address', '')
 
+            # Admission control: surplus requests are turned away before any real work
             try:
-                product = Product.objects.get(id=product_id)
-            except Product.DoesNotExist:
-                return Response({'error': 'Product not found'}, status=status.HTTP_404_NOT_FOUND)
-            except Exception as e:
-                logger.error(f"Error fetching product: {str(e)}")
-                return Response({'error': 'Error fetching product'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-            if product.stock < quantity:
+                ticket = admit({product_id: quantity})
+            except SoldOut:
                 return Response({'error': 'Insufficient stock'}, status=status.HTTP_400_BAD_REQUEST)
+            except QueueFull as e:
+                return queue_full_response(e)
 
-            # Get shipping address
-            shipping_address_obj = None
-            if shipping_address_id:
+            with ticket:
                 try:
-                    shipping_address_obj = Address.objects.get(id=shipping_address_id, user=request.user)
-                except Address.DoesNotExist:
-                    return Response({'error': 'Shipping address not found'}, status=status.HTTP_404_NOT_FOUND)
-            elif not shipping_address_text:
-                return Response({'error': 'Either shipping_address_id or shipping_address is required'}, status=status.HTTP_400_BAD_REQUEST)
+                    product = Product.objects.select_related('category').get(id=product_id)
+                except Product.DoesNotExist:
+                    return Response({'error': 'Product not found'}, status=status.HTTP_404_NOT_FOUND)
+                except Exception as e:
+                    logger.error(f"Error fetching product: {str(e)}")
+                    return Response({'error': 'Error fetching product'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-            try:
-                with transaction.atomic():
-                    total_price = product.price * quantity
-                    order = Order.objects.create(
-                        user=request.user,
-                        product=product,
-                        quantity=quantity,
-                        total_price=total_price,
-                        shipping_address=shipping_address_obj,
-                        shipping_address_text=shipping_address_text if not shipping_address_obj else None
-                    )
-
-                    # Update product stock
-                    product.stock -= quantity
-                    product.save()
-
-                return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
-            except IntegrityError as e:
-                logger.error(f"Integrity error creating order: {str(e)}")
-                return Response({'error': 'Error creating order'}, status=status.HTTP_400_BAD_REQUEST)
-            except Exception as e:
-                logger.error(f"Error creating order: {str(e)}")
-                return Response({'error': 'Error creating order'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                # Cheap early rejection; the authoritative check is the conditional UPDATE below
+                if not product.stock_shard_count and product.stock < quantity:
+                    ticket.sold_out([product.id])
+                    return Response({'error': 'Insufficient stock'}, status=status.HTTP_400_BAD_REQUEST)
+
+                # Get shipping address
+                shipping_address_obj, error_response = resolve_shipping_address(
+                    request.user, shipping_address_id, shipping_address_text
+                )
+                if error_response is not None:
+                    return error_response
+
+                try:
+                    with transaction.atomic():
+                        # Reserve first: the order is only inserted if exactly one product row changed
+                        reserve_stock(
+                            {product.id: quantity},
+                            shard_counts={product.id: product.stock_shard_count},
+                            held=held_by_others(request.user)
+                        )
+                        total_price = product.price * quantity
+                        order = Order.objects.create(
+                            user=request.user,
+                            product=product,
+                            quantity=quantity,
+                            total_price=total_price,
+                            shipping_address=shipping_address_obj,
+                            shipping_address_text=shipping_address_text if not shipping_address_obj else None
+                        )
+                        # Re-read the stock the reservation left (row and shards) for the response
+                        order.product = (
+                            Product.objects.select_related('category').prefetch_related('stock_shards').get(id=product.id)
+                        )
+                        publish('order.created', order_event(order))
+                        # The ordered stock is gone; a hold on the cart line would count it twice
+                        release_holds(request.user, [product.id])
+                    ticket.consumed()
+
+                    return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+                except InsufficientStock as e:
+                    ticket.sold_out(e.product_ids)
+                    return Response({'error': 'Insufficient stock'}, status=status.HTTP_400_BAD_REQUEST)
+                except IntegrityError as e:
+                    logger.error(f"Integrity error creating order: {str(e)}")
+                    return Response({'error': 'Error creating order'}, status=status.HTTP_400_BAD_REQUEST)
+                except Exception as e:
+                    logger.error(f"Error creating order: {str(e)}")
+                    return Response({'error': 'Error creating order'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         except Exception as e:
             logger.error(f"Unexpected error in order creation: {str(e)}")
             return Response({'error': 'An unexpected error occurred'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class OrderDetailView(generics.RetrieveUpdateAPIView):
+class OrderCheckoutView(generics.GenericAPIView):
+    """
+    Checkout
+
+    Convert every item in the user's cart into orders in one transaction.
+    Stock for all products is checked and decremented together; if any
+    product is short, nothing is ordered and the cart is left untouched.
+    """
+    serializer_class = OrderCheckoutSerializer
+    permission_classes = [IsAuthenticated]
+    queryset = Order.objects.none()  # For Swagger schema generation
+
+    @swagger_auto_schema(
+        operation_description="Place orders for every item in the cart",
+        request_body=OrderCheckoutSerializer,
+        responses={
+            201: openapi.Response('Orders created successfully', OrderSerializer(many=True)),
+            400: 'Bad request - empty cart, insufficient stock or validation error',
+            404: 'Shipping address not found',
+            401: 'Authentication required',
+            429: 'Checkout queue full - retry after the Retry-After delay'
+        }
+    )
+    @idempotent
+    def post(self, request):
+        """Checkout the cart"""
+        try:
+            serializer = OrderCheckoutSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            shipping_address_obj, error_response = resolve_shipping_address(
+                request.user,
+                serializer.validated_data.get('shipping_address_id'),
+                serializer.validated_data.get('shipping_address', '')
+            )
+            if error_response is not None:
+                return error_response
+            shipping_address_text = serializer.validated_data.get('shipping_address', '')
+
+            # Admission control on what the cart asks for; the cart is re-read under lock below
+            requested = {}
+            for product_id, quantity in Cart.objects.filter(user=request.user).values_list('product_id', 'quantity'):
+                requested[product_id] = requested.get(product_id, 0) + quantity
+            try:
+                ticket = admit(requested)
+            except SoldOut as e:
+                return Response({'error': 'Insufficient stock', 'product_ids': e.product_ids}, status=status.HTTP_400_BAD_REQUEST)
+            except QueueFull as e:
+                return queue_full_response(e)
+
+            with ticket:
+                try:
+                    with transaction.atomic():
+                        cart_items = list(
+                            Cart.objects.select_for_update()
+                            .filter(user=request.user)
+                            .values_list('id', 'product_id', 'quantity')
+                        )
+                        if not cart_items:
+                            return Response({'error': 'Cart is empty'}, status=status.HTTP_400_BAD_REQUEST)
+
+                        quantities = {}
+                        for _, product_id, quantity in cart_items:
+                            quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+                        # Lock the products once, in id order, so concurrent checkouts cannot deadlock
+                        products = list(
+                            Product.objects.select_for_update()
+                            .filter(id__in=quantities)
+                            .order_by('id')
+                            .values_list('id', 'price', 'stock_shard_count')
+                        )
+                        prices = {product_id: price for product_id, price, _ in products}
+                        reserve_stock(
+                            quantities,
+                            shard_counts={product_id: shard_count for product_id, _, shard_count in products},
+                            held=held_by_others(request.user)
+                        )
+
+                        orders = Order.objects.bulk_create([
+                            Order(
+                                user=request.user,
+                                product_id=product_id,
+                                quantity=quantity,
+                                total_price=prices[product_id] * quantity,
+                                shipping_address=shipping_address_obj,
+                                shipping_address_text=shipping_address_text if not shipping_address_obj else None
+                            )
+                            for product_id, quantity in quantities.items()
+                        ])
+                        # bulk_create skips the post_save rollup signal
+                        record_orders(orders)
+                        publish_many('order.created', [order_event(order) for order in orders])
+                        Cart.objects.filter(id__in=[cart_item_id for cart_item_id, _, _ in cart_items]).delete()
+                except InsufficientStock as e:
+                    ticket.sold_out(e.product_ids)
+                    return Response({'error': 'Insufficient stock', 'product_ids': e.product_ids}, status=status.HTTP_400_BAD_REQUEST)
+                except IntegrityError as e:
+                    logger.error(f"Integrity error during checkout: {str(e)}")
+                    return Response({'error': 'Error creating orders'}, status=status.HTTP_400_BAD_REQUEST)
+                except Exception as e:
+                    logger.error(f"Error during checkout: {str(e)}")
+                    return Response({'error': 'Error creating orders'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                ticket.consumed()
+
+            orders = (
+                Order.objects.filter(id__in=[order.id for order in orders])
+                .select_related('product__category', 'shipping_address')
+            )
+            return Response(OrderSerializer(orders, many=True).data, status=status.HTTP_201_CREATED)
+        except ValidationError as e:
+            return Response({'error': e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Unexpected error in checkout: {str(e)}")
+            return Response({'error': 'An unexpected error occurred'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class OrderExportView(generics.GenericAPIView):
+    """
+    Export Orders (admin only)
+
+    Stream every order as CSV or JSON Lines, flat rows straight from the
+    database. Filter with ?start= and ?end= (ISO dates or datetimes, inclusive)
+    on created_at and ?status=.
+    """
+    permission_classes = [IsAdminUser]
+    queryset = Order.objects.none()  # For Swagger schema generation
+    columns = (
+        'id', 'user_id', 'user__username', 'product_id', 'product__name', 'quantity', 'total_price',
+        'status', 'shipping_address_id', 'shipping_address_text', 'created_at', 'updated_at',
+    )
+
+    @swagger_auto_schema(
+        operation_description="Stream orders as CSV or JSON Lines",
+        manual_parameters=[
+            openapi.Parameter('fmt', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=['csv', 'jsonl'], default='csv'),
+            openapi.Parameter('start', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='Created on or after (ISO date/datetime)'),
+            openapi.Parameter('end', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='Created on or before (ISO date/datetime)'),
+            openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: 'CSV or JSON Lines stream',
+            400: 'Bad request - invalid format or date',
+            403: 'Admin access required'
+        }
+    )
+    def get(self, request):
+        """Export orders"""
+        try:
+            queryset = filter_date_range(Order.objects.all(), 'created_at', request.query_params)
+            if request.query_params.get('status'):
+                queryset = queryset.filter(status=request.query_params['status'])
+            return stream_export(
+                queryset.order_by('created_at', 'id'),
+                self.columns,
+                request.query_params.get('fmt', 'csv'),
+                'orders'
+            )
+        except InvalidExportParameter as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Error exporting orders: {str(e)}")
+            return Response({'error': 'Error exporting orders'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class OrderHistoryView(generics.ListAPIView):
+    """
+    Order History
+
+    All of the user's orders, newest first, including orders that have been
+    moved to the archive. The regular order list only shows live orders.
+    """
+    serializer_class = OrderHistorySerializer
+    permission_classes = [IsAuthenticated]
+    fields = (
+        'id', 'product_id', 'product__name', 'quantity', 'total_price', 'status',
+        'shipping_address_id', 'shipping_address_text', 'created_at', 'updated_at',
+    )
+
+    def get_queryset(self):
+        # Handle Swagger schema generation
+        if getattr(self, 'swagger_fake_view', False) or not self.request.user.is_authenticated:
+            return Order.objects.none()
+        live = (
+            Order.objects.filter(user=self.request.user)
+            .annotate(archived=Value(False, output_field=BooleanField()))
+            .values(*self.fields, 'archived')
+            .order_by()
+        )
+        archived = (
+            ArchivedOrder.objects.filter(user=self.request.user)
+            .annotate(archived=Value(True, output_field=BooleanField()))
+            .values(*self.fields, 'archived')
+            .order_by()
+        )
+        return live.union(archived, all=True).order_by('-created_at', '-id')
+
+
+class OrderDetailView(AutoPrefetchMixin, generics.RetrieveUpdateAPIView):
     """Get and update a specific order"""
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
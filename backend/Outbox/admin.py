@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import OutboxEvent
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'event_type', 'status', 'attempts', 'available_at', 'created_at', 'processed_at')
+    list_filter = ('status', 'event_type', 'created_at')
+    search_fields = ('event_type', 'last_error')
+    readonly_fields = ('created_at', 'processed_at', 'claimed_by', 'claimed_at')
@@ -0,0 +1,53 @@
+"""
+Transactional outbox.
+
+Views call publish() inside the transaction that creates an order or payment,
+so the event row commits (or rolls back) together with it. Side effects run
+later in `python manage.py run_outbox_worker`, which calls the handlers
+registered for each event type. Apps register handlers in an
+outbox_handlers.py module:
+
+    from Outbox.events import handler
+
+    @handler('order.created')
+    def notify_customer(payload):
+        ...
+
+Handlers can run more than once for an event (after a crash or a retry), so
+they must be idempotent.
+"""
+from collections import defaultdict
+
+from django.utils.module_loading import autodiscover_modules
+from .models import OutboxEvent
+
+_handlers = defaultdict(list)
+
+
+def publish(event_type, payload):
+    """Record an event in the current transaction"""
+    return OutboxEvent.objects.create(event_type=event_type, payload=payload)
+
+
+def publish_many(event_type, payloads):
+    """Record one event per payload with a single INSERT"""
+    return OutboxEvent.objects.bulk_create(
+        [OutboxEvent(event_type=event_type, payload=payload) for payload in payloads]
+    )
+
+
+def handler(event_type):
+    """Register the decorated function to run for every event of event_type"""
+    def register(func):
+        _handlers[event_type].append(func)
+        return func
+    return register
+
+
+def get_handlers(event_type):
+    return list(_handlers.get(event_type, ()))
+
+
+def autodiscover():
+    """Import every installed app's outbox_handlers module"""
+    autodiscover_modules('outbox_handlers')
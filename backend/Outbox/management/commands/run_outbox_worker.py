@@ -0,0 +1,32 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from Outbox.events import autodiscover
+from Outbox.worker import process_batch
+
+
+class Command(BaseCommand):
+    help = 'Process outbox events: claim due events in batches and run their handlers in a thread pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when no events are due')
+        parser.add_argument('--once', action='store_true', help='Drain the due events and exit')
+
+    def handle(self, *args, **options):
+        autodiscover()
+        processed = 0
+        with ThreadPoolExecutor(max_workers=options['threads'], thread_name_prefix='outbox') as executor:
+            try:
+                while True:
+                    claimed = process_batch(executor, options['batch_size'])
+                    processed += claimed
+                    if claimed:
+                        continue
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+            except KeyboardInterrupt:
+                pass
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} outbox events"))
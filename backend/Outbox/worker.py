@@ -0,0 +1,87 @@
+"""
+Outbox worker: claims due events in batches and runs their handlers in a
+thread pool. Events are claimed with a conditional UPDATE stamped with a
+per-batch token, so several workers can poll the same table without running
+an event twice. Failed events are retried with exponential backoff; events
+left 'processing' by a crashed worker are reclaimed after a timeout.
+"""
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, Q
+from django.utils import timezone
+from .events import get_handlers
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def claim_batch(batch_size):
+    """Claim up to batch_size due events; returns them"""
+    now = timezone.now()
+    stale = now - timedelta(seconds=_setting('OUTBOX_CLAIM_TIMEOUT', 300))
+    due = Q(status='pending', available_at__lte=now) | Q(status='processing', claimed_at__lt=stale)
+    ids = list(OutboxEvent.objects.filter(due).order_by('id').values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    # Only rows still due are taken; a concurrent worker that got there first wins
+    OutboxEvent.objects.filter(due, id__in=ids).update(status='processing', claimed_by=token, claimed_at=now)
+    return list(OutboxEvent.objects.filter(claimed_by=token, status='processing').order_by('id'))
+
+
+def run_event(event):
+    """Run every handler for event; returns None on success or the error text"""
+    try:
+        for func in get_handlers(event.event_type):
+            func(event.payload)
+        return None
+    except Exception as e:
+        logger.error(f"Outbox handler failed for event #{event.id} ({event.event_type}): {str(e)}")
+        return f"{type(e).__name__}: {e}"
+    finally:
+        close_old_connections()
+
+
+def backoff(attempts):
+    """Seconds to wait before retry number attempts"""
+    base = _setting('OUTBOX_RETRY_BACKOFF', 5)
+    return min(base * 2 ** (attempts - 1), _setting('OUTBOX_RETRY_BACKOFF_MAX', 3600))
+
+
+def process_batch(executor, batch_size):
+    """Claim and process one batch; returns the number of events claimed"""
+    events = claim_batch(batch_size)
+    if not events:
+        return 0
+
+    errors = dict(zip((event.id for event in events), executor.map(run_event, events)))
+    now = timezone.now()
+
+    succeeded = [event_id for event_id, error in errors.items() if error is None]
+    if succeeded:
+        OutboxEvent.objects.filter(id__in=succeeded).update(
+            status='done', attempts=F('attempts') + 1, processed_at=now, last_error=''
+        )
+
+    max_attempts = _setting('OUTBOX_MAX_ATTEMPTS', 10)
+    for event in events:
+        error = errors[event.id]
+        if error is None:
+            continue
+        attempts = event.attempts + 1
+        OutboxEvent.objects.filter(id=event.id).update(
+            status='failed' if attempts >= max_attempts else 'pending',
+            attempts=attempts,
+            available_at=now + timedelta(seconds=backoff(attempts)),
+            last_error=error[:2000],
+        )
+    return len(events)
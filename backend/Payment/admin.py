@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Payment
+from .models import Payment, ArchivedPayment
 
 
 @admin.register(Payment)
@@ -21,3 +21,11 @@ class PaymentAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at')
         }),
     )
+
+
+@admin.register(ArchivedPayment)
+class ArchivedPaymentAdmin(admin.ModelAdmin):
+    list_display = ('id', 'customer_name', 'order', 'amount', 'paid_via', 'status', 'payment_date', 'archived_at')
+    list_filter = ('status', 'paid_via', 'payment_date')
+    search_fields = ('customer_name', 'customer__username', 'transaction_id', 'order__id')
+    readonly_fields = ('archived_at',)
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Order', '0005_archivedorder'),
+        ('Payment', '0002_payment_payment_customer_date_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPayment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('customer_name', models.CharField(max_length=200)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('paid_via', models.CharField(choices=[('credit_card', 'Credit Card'), ('debit_card', 'Debit Card'), ('paypal', 'PayPal'), ('bank_transfer', 'Bank Transfer'), ('cash_on_delivery', 'Cash on Delivery'), ('stripe', 'Stripe'), ('razorpay', 'Razorpay'), ('other', 'Other')], max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('refunded', 'Refunded'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('transaction_id', models.CharField(blank=True, max_length=200, null=True)),
+                ('payment_date', models.DateTimeField()),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_payments', to=settings.AUTH_USER_MODEL)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payments', to='Order.archivedorder')),
+            ],
+            options={
+                'verbose_name': 'Archived Payment',
+                'verbose_name_plural': 'Archived Payments',
+                'db_table': 'payment_archive',
+                'ordering': ['-payment_date'],
+                'indexes': [models.Index(fields=['customer', '-payment_date', '-id'], name='payment_archive_customer_idx'), models.Index(fields=['payment_date', 'id'], name='payment_archive_date_idx')],
+            },
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator
-from Order.models import Order
+from Order.models import Order, ArchivedOrder
 
 
 class Payment(models.Model):
@@ -43,6 +43,11 @@ class Payment(models.Model):
         verbose_name = 'Payment'
         verbose_name_plural = 'Payments'
         ordering = ['-payment_date', '-created_at']
+        indexes = [
+            # Keyset pagination seeks on (payment_date, id)
+            models.Index(fields=['customer', '-payment_date', '-id'], name='payment_customer_date_idx'),
+            models.Index(fields=['-payment_date', '-id'], name='payment_date_idx'),
+        ]
 
     def __str__(self):
         return f"Payment #{self.id} - {self.customer_name} - ${self.amount}"
@@ -52,3 +57,33 @@ class Payment(models.Model):
         if not self.customer_name and self.customer:
             self.customer_name = f"{self.customer.first_name} {self.customer.last_name}".strip() or self.customer.username
         super().save(*args, **kwargs)
+
+
+class ArchivedPayment(models.Model):
+    """Payment of an archived order, moved together with it. Keeps the original id."""
+    id = models.BigIntegerField(primary_key=True)
+    order = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE, related_name='payments')
+    customer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_payments')
+    customer_name = models.CharField(max_length=200)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    paid_via = models.CharField(max_length=50, choices=Payment.PAYMENT_METHOD_CHOICES)
+    status = models.CharField(max_length=20, choices=Payment.STATUS_CHOICES)
+    transaction_id = models.CharField(max_length=200, blank=True, null=True)
+    payment_date = models.DateTimeField()
+    notes = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'payment_archive'
+        verbose_name = 'Archived Payment'
+        verbose_name_plural = 'Archived Payments'
+        ordering = ['-payment_date']
+        indexes = [
+            models.Index(fields=['customer', '-payment_date', '-id'], name='payment_archive_customer_idx'),
+            models.Index(fields=['payment_date', 'id'], name='payment_archive_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived payment #{self.id} - {self.customer_name} - ${self.amount}"
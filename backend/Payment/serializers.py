@@ -2,9 +2,10 @@ from rest_framework import serializers
 from .models import Payment
 from Order.serializers import OrderSerializer
 from AuthUser.serializers import UserSerializer
+from backend.serializers import DynamicFieldsModelSerializer
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(DynamicFieldsModelSerializer):
     """Serializer for Payment model"""
     order = OrderSerializer(read_only=True)
     customer = UserSerializer(read_only=True)
@@ -15,6 +16,7 @@ class PaymentSerializer(serializers.ModelSerializer):
         fields = ('id', 'order', 'customer', 'customer_name', 'amount', 'paid_via', 'status', 
                  'transaction_id', 'payment_date', 'notes', 'created_at', 'updated_at')
         read_only_fields = ('id', 'customer', 'customer_name', 'payment_date', 'created_at', 'updated_at')
+        expandable_fields = ('order', 'customer')
 
 
 class PaymentCreateSerializer(serializers.Serializer):
@@ -44,3 +46,16 @@ class PaymentUpdateSerializer(serializers.ModelSerializer):
         model = Payment
         fields = ('status', 'transaction_id', 'notes')
         read_only_fields = ('id', 'order', 'customer', 'customer_name', 'amount', 'paid_via', 'payment_date', 'created_at', 'updated_at')
+
+
+class PaymentHistorySerializer(serializers.Serializer):
+    """Serializer for a live or archived payment in the payment history"""
+    id = serializers.IntegerField()
+    order_id = serializers.IntegerField()
+    customer_name = serializers.CharField()
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    paid_via = serializers.CharField()
+    status = serializers.CharField()
+    transaction_id = serializers.CharField(allow_null=True)
+    payment_date = serializers.DateTimeField()
+    archived = serializers.BooleanField()
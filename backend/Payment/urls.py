@@ -1,10 +1,12 @@
 from django.urls import path
-from .views import PaymentListView, PaymentDetailView, PaymentByOrderView
+from .views import PaymentListView, PaymentDetailView, PaymentByOrderView, PaymentExportView, PaymentHistoryView
 
 app_name = 'payment'
 
 urlpatterns = [
     path('', PaymentListView.as_view(), name='payment-list'),
+    path('export/', PaymentExportView.as_view(), name='payment-export'),
+    path('history/', PaymentHistoryView.as_view(), name='payment-history'),
     path('<int:pk>/', PaymentDetailView.as_view(), name='payment-detail'),
     path('order/<int:order_id>/', PaymentByOrderView.as_view(), name='payment-by-order'),
 ]
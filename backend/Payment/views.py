@@ -2,17 +2,26 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Value
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
 import logging
-from .models import Payment
-from .serializers import PaymentSerializer, PaymentCreateSerializer, PaymentUpdateSerializer
+from .models import Payment, ArchivedPayment
+from .serializers import PaymentSerializer, PaymentCreateSerializer, PaymentUpdateSerializer, PaymentHistorySerializer
 from Order.models import Order
+from backend.pagination import KeysetPaginationMixin
+from backend.export import stream_export, filter_date_range, InvalidExportParameter
+from Idempotency.decorators import idempotent
+from Outbox.events import publish
+from backend.prefetch import AutoPrefetchMixin
 
 logger = logging.getLogger(__name__)
 
 
-class PaymentListView(generics.ListCreateAPIView):
+class PaymentListView(AutoPrefetchMixin, KeysetPaginationMixin, generics.ListCreateAPIView):
     """List user's payments and create new payment"""
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-payment_date', '-id')
 
     def get_queryset(self):
         # Handle Swagger schema generation
@@ -29,6 +38,7 @@ class PaymentListView(generics.ListCreateAPIView):
             return PaymentCreateSerializer
         return PaymentSerializer
 
+    @idempotent
     def create(self, request, *args, **kwargs):
         try:
             serializer = PaymentCreateSerializer(data=request.data)
@@ -68,6 +78,14 @@ class PaymentListView(generics.ListCreateAPIView):
                         notes=notes,
                         status='completed'  # Auto-complete on creation, can be updated later
                     )
+                    publish('payment.created', {
+                        'payment_id': payment.id,
+                        'order_id': order.id,
+                        'customer_id': request.user.id,
+                        'amount': payment.amount,
+                        'paid_via': payment.paid_via,
+                        'status': payment.status,
+                    })
 
                 return Response(PaymentSerializer(payment).data, status=status.HTTP_201_CREATED)
             except IntegrityError as e:
@@ -81,7 +99,87 @@ class PaymentListView(generics.ListCreateAPIView):
             return Response({'error': 'An unexpected error occurred'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class PaymentDetailView(generics.RetrieveUpdateAPIView):
+class PaymentExportView(generics.GenericAPIView):
+    """
+    Export Payments (admin only)
+
+    Stream every payment as CSV or JSON Lines, flat rows straight from the
+    database. Filter with ?start= and ?end= (ISO dates or datetimes, inclusive)
+    on payment_date, ?status= and ?paid_via=.
+    """
+    permission_classes = [IsAdminUser]
+    queryset = Payment.objects.none()  # For Swagger schema generation
+    columns = (
+        'id', 'order_id', 'customer_id', 'customer_name', 'amount', 'paid_via', 'status',
+        'transaction_id', 'payment_date', 'notes', 'created_at', 'updated_at',
+    )
+
+    @swagger_auto_schema(
+        operation_description="Stream payments as CSV or JSON Lines",
+        manual_parameters=[
+            openapi.Parameter('fmt', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=['csv', 'jsonl'], default='csv'),
+            openapi.Parameter('start', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='Paid on or after (ISO date/datetime)'),
+            openapi.Parameter('end', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='Paid on or before (ISO date/datetime)'),
+            openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('paid_via', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: 'CSV or JSON Lines stream',
+            400: 'Bad request - invalid format or date',
+            403: 'Admin access required'
+        }
+    )
+    def get(self, request):
+        """Export payments"""
+        try:
+            queryset = filter_date_range(Payment.objects.all(), 'payment_date', request.query_params)
+            for field in ('status', 'paid_via'):
+                if request.query_params.get(field):
+                    queryset = queryset.filter(**{field: request.query_params[field]})
+            return stream_export(
+                queryset.order_by('payment_date', 'id'),
+                self.columns,
+                request.query_params.get('fmt', 'csv'),
+                'payments'
+            )
+        except InvalidExportParameter as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Error exporting payments: {str(e)}")
+            return Response({'error': 'Error exporting payments'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class PaymentHistoryView(generics.ListAPIView):
+    """
+    Payment History
+
+    All of the user's payments, newest first, including payments of archived
+    orders. The regular payment list only shows live payments.
+    """
+    serializer_class = PaymentHistorySerializer
+    permission_classes = [IsAuthenticated]
+    fields = ('id', 'order_id', 'customer_name', 'amount', 'paid_via', 'status', 'transaction_id', 'payment_date')
+
+    def get_queryset(self):
+        # Handle Swagger schema generation
+        if getattr(self, 'swagger_fake_view', False) or not self.request.user.is_authenticated:
+            return Payment.objects.none()
+        live = (
+            Payment.objects.filter(customer=self.request.user)
+            .annotate(archived=Value(False, output_field=BooleanField()))
+            .values(*self.fields, 'archived')
+            .order_by()
+        )
+        archived = (
+            ArchivedPayment.objects.filter(customer=self.request.user)
+            .annotate(archived=Value(True, output_field=BooleanField()))
+            .values(*self.fields, 'archived')
+            .order_by()
+        )
+        return live.union(archived, all=True).order_by('-payment_date', '-id')
+
+
+class PaymentDetailView(AutoPrefetchMixin, generics.RetrieveUpdateAPIView):
     """Get or update a specific payment"""
     serializer_class = PaymentSerializer
     permission_classes = [IsAuthenticated]
@@ -102,7 +200,7 @@ class PaymentDetailView(generics.RetrieveUpdateAPIView):
         return PaymentSerializer
 
 
-class PaymentByOrderView(generics.ListAPIView):
+class PaymentByOrderView(AutoPrefetchMixin, generics.ListAPIView):
     """Get all payments for a specific order"""
     serializer_class = PaymentSerializer
     permission_classes = [IsAuthenticated]
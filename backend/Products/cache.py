@@ -0,0 +1,75 @@
+"""
+Read-through catalog cache for product payloads.
+
+Serialized product data is kept in process memory and tagged with the catalog
+generation it was built under. The generation number lives in Django's cache
+framework and is bumped by the Product/Category signals, so every worker drops
+its stale entries on the next read without relying on a TTL.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CATALOG_GENERATION_KEY = 'products:catalog_generation'
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+
+def _max_entries():
+    return getattr(settings, 'CATALOG_CACHE_MAX_ENTRIES', 512)
+
+
+def get_generation():
+    """Return the current catalog generation number"""
+    generation = cache.get(CATALOG_GENERATION_KEY)
+    if generation is None:
+        cache.add(CATALOG_GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(CATALOG_GENERATION_KEY, 1)
+    return generation
+
+
+def bump_generation():
+    """Invalidate every cached catalog payload in all workers"""
+    try:
+        cache.incr(CATALOG_GENERATION_KEY)
+    except ValueError:
+        # Key was evicted or never set - start a fresh generation
+        cache.add(CATALOG_GENERATION_KEY, 1, timeout=None)
+        cache.incr(CATALOG_GENERATION_KEY)
+
+
+def invalidate_on_commit():
+    """Bump the generation once the current transaction commits"""
+    transaction.on_commit(bump_generation)
+
+
+def get_or_build(key, builder):
+    """
+    Return the cached payload for key, calling builder() on a miss.
+    Entries built under an older generation are treated as misses.
+    """
+    generation = get_generation()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == generation:
+            _entries.move_to_end(key)
+            return entry[1]
+
+    payload = builder()
+
+    with _lock:
+        _entries[key] = (generation, payload)
+        _entries.move_to_end(key)
+        while len(_entries) > _max_entries():
+            _entries.popitem(last=False)
+    return payload
+
+
+def clear():
+    """Drop all entries held by this process"""
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,192 @@
+"""
+Stock reservation for order creation.
+
+Stock is only ever decremented with conditional UPDATEs that match rows that
+still have enough stock, so concurrent checkouts cannot oversell and no other
+product column is rewritten.
+
+A hot product can optionally be sharded: its stock budget is spread over
+StockShard rows and each order decrements a random shard, falling back to the
+other shards and then to the product row. collect_shards() pulls shard stock
+back into the product row and rebalance_stock() spreads it out again.
+"""
+import random
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Now
+from .models import Product, StockShard
+from . import cache as catalog_cache
+
+
+class InsufficientStock(Exception):
+    """Raised when one or more products do not have enough stock"""
+
+    def __init__(self, product_ids):
+        self.product_ids = sorted(product_ids)
+        super().__init__(f"Insufficient stock for products {self.product_ids}")
+
+
+def reserve_stock(quantities, shard_counts=None, held=None):
+    """
+    Decrement stock for {product_id: quantity}.
+
+    Unsharded products are decremented together in a single UPDATE; sharded
+    products ({product_id: stock_shard_count}, looked up when not given) go
+    through their shards. Every product must have enough stock; otherwise
+    nothing is changed and InsufficientStock is raised.
+
+    held(product_ref) may return an expression for stock of an unsharded
+    product that is spoken for elsewhere (e.g. other users' cart holds); it is
+    kept back from the order.
+    """
+    if not quantities:
+        return
+    if shard_counts is None:
+        shard_counts = dict(
+            Product.objects.filter(pk__in=quantities, stock_shard_count__gt=0).values_list('pk', 'stock_shard_count')
+        )
+    shard_counts = {product_id: count for product_id, count in shard_counts.items() if count}
+
+    with transaction.atomic():
+        _reserve_product_rows({
+            product_id: quantity for product_id, quantity in quantities.items() if product_id not in shard_counts
+        }, held)
+        for product_id in sorted(shard_counts):
+            if product_id in quantities:
+                _reserve_sharded(product_id, quantities[product_id], shard_counts[product_id])
+
+    catalog_cache.invalidate_on_commit()
+
+
+def _reserve_product_rows(quantities, held=None):
+    if not quantities:
+        return
+
+    def needed(quantity):
+        if held is None:
+            return quantity
+        return Value(quantity) + held(OuterRef('pk'))
+
+    if len(quantities) == 1:
+        # UPDATE product SET stock = stock - q WHERE id = ? AND stock >= q
+        [(product_id, quantity)] = quantities.items()
+        updated = Product.objects.filter(pk=product_id, stock__gte=needed(quantity)).update(
+            stock=F('stock') - quantity,
+            updated_at=Now()
+        )
+        if updated != 1:
+            raise InsufficientStock([product_id])
+        return
+
+    product_ids = sorted(quantities)
+    condition = Q()
+    for product_id in product_ids:
+        condition |= Q(pk=product_id, stock__gte=needed(quantities[product_id]))
+
+    try:
+        with transaction.atomic():
+            updated = Product.objects.filter(condition).update(
+                stock=Case(
+                    *[When(pk=product_id, then=F('stock') - quantities[product_id]) for product_id in product_ids],
+                    output_field=IntegerField()
+                ),
+                updated_at=Now()
+            )
+            if updated != len(product_ids):
+                # Raising inside the savepoint rolls back the rows that did match
+                raise InsufficientStock(product_ids)
+    except InsufficientStock:
+        available = F('stock') if held is None else F('stock') - held(OuterRef('pk'))
+        stock = dict(
+            Product.objects.filter(pk__in=product_ids).annotate(available=available).values_list('pk', 'available')
+        )
+        short = [product_id for product_id in product_ids if stock.get(product_id, 0) < quantities[product_id]]
+        raise InsufficientStock(short or product_ids)
+
+
+def _reserve_sharded(product_id, quantity, shard_count):
+    # Write first: on SQLite a read before the first write would have to
+    # upgrade its lock and fails immediately under contention
+    shards = list(range(shard_count))
+    random.shuffle(shards)
+    for shard in shards:
+        # The shard's updated_at (not the product row's) feeds the detail validators
+        updated = StockShard.objects.filter(product_id=product_id, shard=shard, stock__gte=quantity).update(
+            stock=F('stock') - quantity,
+            updated_at=Now()
+        )
+        if updated:
+            return
+
+    # No single shard can cover the order: try the product row, then pull the
+    # fragmented shard stock back into it and try once more
+    for attempt in range(2):
+        updated = Product.objects.filter(pk=product_id, stock__gte=quantity).update(
+            stock=F('stock') - quantity,
+            updated_at=Now()
+        )
+        if updated:
+            return
+        if attempt == 0 and not collect_shards(product_id):
+            break
+    raise InsufficientStock([product_id])
+
+
+def shard_stock_total(product_ref):
+    """Stock held in product_ref's shards, as a subquery expression"""
+    shards = (
+        StockShard.objects.filter(product_id=product_ref)
+        .order_by().values('product_id').annotate(total=Sum('stock')).values('total')
+    )
+    return Coalesce(Subquery(shards, output_field=IntegerField()), 0)
+
+
+def total_stock(product_id):
+    """Stock on the product row plus all of its shards"""
+    stock = Product.objects.values_list('stock', flat=True).get(pk=product_id)
+    shard_stock = StockShard.objects.filter(product_id=product_id).aggregate(total=Sum('stock'))['total'] or 0
+    return stock + shard_stock
+
+
+def collect_shards(product_id):
+    """Move all shard stock back into the product row; returns the amount moved"""
+    with transaction.atomic():
+        shards = list(StockShard.objects.select_for_update().filter(product_id=product_id, stock__gt=0))
+        moved = sum(shard.stock for shard in shards)
+        if moved:
+            StockShard.objects.filter(pk__in=[shard.pk for shard in shards]).update(stock=0, updated_at=Now())
+            Product.objects.filter(pk=product_id).update(stock=F('stock') + moved, updated_at=Now())
+    return moved
+
+
+def shard_stock(product_id, shard_count):
+    """
+    Spread a product's stock evenly over shard_count shards.
+    A shard_count of 0 moves everything back to the product row and disables sharding.
+    """
+    with transaction.atomic():
+        product = Product.objects.select_for_update().get(pk=product_id)
+        collect_shards(product_id)
+        StockShard.objects.filter(product_id=product_id, shard__gte=shard_count).delete()
+        if shard_count:
+            stock = Product.objects.values_list('stock', flat=True).get(pk=product_id)
+            per_shard, remainder = divmod(stock, shard_count)
+            StockShard.objects.bulk_create(
+                [
+                    StockShard(product=product, shard=shard, stock=per_shard + (1 if shard < remainder else 0))
+                    for shard in range(shard_count)
+                ],
+                update_conflicts=True,
+                unique_fields=['product', 'shard'],
+                update_fields=['stock', 'updated_at'],
+            )
+            Product.objects.filter(pk=product_id).update(stock=0, stock_shard_count=shard_count, updated_at=Now())
+        else:
+            Product.objects.filter(pk=product_id).update(stock_shard_count=0, updated_at=Now())
+    catalog_cache.invalidate_on_commit()
+
+
+def rebalance_stock(product_id):
+    """Pull shard stock back into the product row and spread it evenly again"""
+    shard_count = Product.objects.values_list('stock_shard_count', flat=True).get(pk=product_id)
+    shard_stock(product_id, shard_count)
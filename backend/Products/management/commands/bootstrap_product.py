@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from Products.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Create the default product for single product ecommerce if it does not exist yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--name', default='Default Product')
+        parser.add_argument('--description', default='Product description')
+        parser.add_argument('--price', default='0.00')
+        parser.add_argument('--stock', type=int, default=0)
+
+    def handle(self, *args, **options):
+        product, created = Product.objects.get_or_create(
+            id=1,
+            defaults={
+                'name': options['name'],
+                'description': options['description'],
+                'price': options['price'],
+                'stock': options['stock'],
+                'is_available': True
+            }
+        )
+        if created:
+            self.stdout.write(self.style.SUCCESS(f"Created default product #{product.pk}"))
+        else:
+            self.stdout.write(f"Default product #{product.pk} already exists")
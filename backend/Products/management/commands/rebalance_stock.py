@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from Products.models import Product
+from Products.inventory import rebalance_stock, total_stock
+
+
+class Command(BaseCommand):
+    help = 'Pull shard stock back into the product row and spread it evenly over the shards again'
+
+    def add_arguments(self, parser):
+        parser.add_argument('product_ids', type=int, nargs='*', help='Defaults to every sharded product')
+
+    def handle(self, *args, **options):
+        product_ids = options['product_ids'] or list(
+            Product.objects.filter(stock_shard_count__gt=0).values_list('pk', flat=True)
+        )
+        for product_id in product_ids:
+            rebalance_stock(product_id)
+            self.stdout.write(f"Product #{product_id}: total stock {total_stock(product_id)}")
+        self.stdout.write(self.style.SUCCESS(f"Rebalanced {len(product_ids)} products"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from Products import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text product search index from the product table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError('Full-text search index requires the SQLite database backend')
+        with transaction.atomic():
+            indexed = search.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} products"))
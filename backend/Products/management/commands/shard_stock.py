@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from Products.models import Product
+from Products.inventory import shard_stock, total_stock
+
+
+class Command(BaseCommand):
+    help = (
+        "Spread a product's stock over N counter rows so concurrent checkouts update different rows. "
+        "Use --shards 0 to move all stock back to the product row."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('product_id', type=int)
+        parser.add_argument('--shards', type=int, required=True)
+
+    def handle(self, *args, **options):
+        product_id, shards = options['product_id'], options['shards']
+        if shards < 0:
+            raise CommandError('--shards must be 0 or more')
+        if not Product.objects.filter(pk=product_id).exists():
+            raise CommandError(f"Product #{product_id} does not exist")
+        shard_stock(product_id, shards)
+        self.stdout.write(self.style.SUCCESS(
+            f"Product #{product_id}: {shards} shards, total stock {total_stock(product_id)}"
+        ))
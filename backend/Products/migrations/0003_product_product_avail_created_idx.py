@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Category', '0001_initial'),
+        ('Products', '0002_product_category'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_available', '-created_at', '-id'], name='product_avail_created_idx'),
+        ),
+    ]
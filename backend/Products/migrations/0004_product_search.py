@@ -0,0 +1,40 @@
+from django.db import migrations
+
+SEARCH_TABLE = 'product_search'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+        "USING fts5(name, description, category_name, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    Product = apps.get_model('Products', 'Product')
+    rows = [
+        (product.pk, product.name, product.description, product.category.name if product.category else '')
+        for product in Product.objects.filter(is_available=True).select_related('category').iterator()
+    ]
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, name, description, category_name) VALUES (%s, %s, %s, %s)",
+            rows
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Category', '0001_initial'),
+        ('Products', '0003_product_product_avail_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:02
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Products', '0005_product_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='stock_shard_count',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Number of StockShard rows holding part of the stock (0 = not sharded)'),
+        ),
+        migrations.CreateModel(
+            name='StockShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('stock', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_shards', to='Products.product')),
+            ],
+            options={
+                'verbose_name': 'Stock Shard',
+                'verbose_name_plural': 'Stock Shards',
+                'db_table': 'product_stock_shard',
+                'unique_together': {('product', 'shard')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Products', '0006_stock_shards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockshard',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -8,9 +8,19 @@ class Product(models.Model):
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     stock = models.IntegerField(validators=[MinValueValidator(0)], default=0)
+    stock_shard_count = models.PositiveSmallIntegerField(default=0, help_text="Number of StockShard rows holding part of the stock (0 = not sharded)")
     image = models.ImageField(upload_to='products/', blank=True, null=True)
     category = models.ForeignKey('Category.Category', on_delete=models.SET_NULL, null=True, blank=True, related_name='products')
     is_available = models.BooleanField(default=True)
+    # Rating aggregates maintained incrementally from Review writes
+    avg_rating = models.FloatField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_total = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -18,6 +28,45 @@ class Product(models.Model):
         db_table = 'product'
         verbose_name = 'Product'
         verbose_name_plural = 'Products'
+        indexes = [
+            # Keyset pagination seeks on (created_at, id) over available products
+            models.Index(fields=['is_available', '-created_at', '-id'], name='product_avail_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
+
+    @property
+    def rating_histogram(self):
+        return {str(star): getattr(self, f'rating_{star}_count') for star in range(1, 6)}
+
+    @property
+    def total_stock(self):
+        """Stock on the product row plus any stock held in shards"""
+        if not self.stock_shard_count:
+            return self.stock
+        if 'stock_shards' in getattr(self, '_prefetched_objects_cache', {}):
+            shard_stock = sum(shard.stock for shard in self.stock_shards.all())
+        else:
+            shard_stock = self.stock_shards.aggregate(total=models.Sum('stock'))['total'] or 0
+        return self.stock + shard_stock
+
+
+class StockShard(models.Model):
+    """
+    Slice of a product's stock budget. Spreading the stock of a hot product
+    over several rows lets concurrent checkouts decrement different rows.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='stock_shards')
+    shard = models.PositiveSmallIntegerField()
+    stock = models.IntegerField(validators=[MinValueValidator(0)], default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'product_stock_shard'
+        verbose_name = 'Stock Shard'
+        verbose_name_plural = 'Stock Shards'
+        unique_together = ['product', 'shard']
+
+    def __str__(self):
+        return f"{self.product.name} - shard {self.shard}"
@@ -0,0 +1,21 @@
+"""Outbox handlers for product side effects of orders"""
+import logging
+
+from django.conf import settings
+from Outbox.events import handler
+from .inventory import total_stock
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+
+@handler('order.created')
+def low_stock_alert(payload):
+    """Warn when an order leaves a product at or below LOW_STOCK_ALERT_THRESHOLD"""
+    threshold = getattr(settings, 'LOW_STOCK_ALERT_THRESHOLD', 5)
+    try:
+        stock = total_stock(payload['product_id'])
+    except Product.DoesNotExist:
+        return
+    if stock <= threshold:
+        logger.warning(f"Low stock: product #{payload['product_id']} has {stock} left")
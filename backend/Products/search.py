@@ -0,0 +1,157 @@
+"""
+Full-text product search backed by an SQLite FTS5 virtual table.
+
+The product_search table mirrors the name, description and category name of
+every available product (rowid = product id). Signals keep it in sync and the
+rebuild_product_search command repopulates it in bulk. Other database
+backends fall back to a plain icontains filter.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from .models import Product
+
+SEARCH_TABLE = 'product_search'
+
+# bm25() column weights: name, description, category_name
+RANK_WEIGHTS = (10.0, 1.0, 5.0)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_INSERT_SQL = f"INSERT INTO {SEARCH_TABLE} (rowid, name, description, category_name) VALUES (%s, %s, %s, %s)"
+
+
+def is_supported():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query: every term must match, as a prefix"""
+    tokens = _TOKEN_RE.findall(text or '')
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _rows(products):
+    return [
+        (product.pk, product.name, product.description, product.category.name if product.category else '')
+        for product in products
+    ]
+
+
+def index_products(products):
+    """Insert or refresh the index rows for the given products"""
+    if not is_supported():
+        return
+    products = list(products)
+    if not products:
+        return
+    available = [product for product in products if product.is_available]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [(product.pk,) for product in products]
+        )
+        cursor.executemany(
+            _INSERT_SQL,
+            _rows(available)
+        )
+
+
+def remove_products(product_ids):
+    if not is_supported() or not product_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [(product_id,) for product_id in product_ids]
+        )
+
+
+def rebuild(batch_size=2000):
+    """Repopulate the whole index; returns the number of indexed products"""
+    if not is_supported():
+        return 0
+    queryset = (
+        Product.objects.filter(is_available=True)
+        .select_related('category')
+        .only('id', 'name', 'description', 'category__name')
+        .order_by('id')
+    )
+    indexed = 0
+    batch = []
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        for product in queryset.iterator(chunk_size=batch_size):
+            batch.append(product)
+            if len(batch) >= batch_size:
+                cursor.executemany(
+                    _INSERT_SQL,
+                    _rows(batch)
+                )
+                indexed += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(
+                _INSERT_SQL,
+                _rows(batch)
+            )
+            indexed += len(batch)
+    return indexed
+
+
+class RankedProducts:
+    """
+    Lazy, sliceable BM25-ranked search result set.
+    Pagination calls count() once and slices one page, so only that page's
+    products are loaded.
+    """
+
+    def __init__(self, match_query):
+        self.match_query = match_query
+
+    def count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s",
+                [self.match_query]
+            )
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start = key.start or 0
+        limit = -1 if key.stop is None else max(key.stop - start, 0)
+        weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+                f"ORDER BY bm25({SEARCH_TABLE}, {weights}) LIMIT %s OFFSET %s",
+                [self.match_query, limit, start]
+            )
+            product_ids = [row[0] for row in cursor.fetchall()]
+        # The index can lag behind is_available changes made with QuerySet.update()
+        products = Product.objects.filter(is_available=True).select_related('category').in_bulk(product_ids)
+        return [products[product_id] for product_id in product_ids if product_id in products]
+
+
+def search(text):
+    """Return the ranked products matching text"""
+    if is_supported():
+        return RankedProducts(build_match_query(text))
+
+    condition = Q()
+    for token in _TOKEN_RE.findall(text or ''):
+        condition &= (
+            Q(name__icontains=token) | Q(description__icontains=token) | Q(category__name__icontains=token)
+        )
+    return (
+        Product.objects.filter(is_available=True)
+        .filter(condition)
+        .select_related('category')
+        .order_by('-created_at', '-id')
+    )
@@ -1,13 +1,21 @@
 from rest_framework import serializers
 from .models import Product
+from backend.serializers import DynamicFieldsModelSerializer
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(DynamicFieldsModelSerializer):
     """Serializer for Product model"""
     category_name = serializers.CharField(source='category.name', read_only=True)
-    
+    rating_histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+    total_stock = serializers.ReadOnlyField()
+
     class Meta:
         model = Product
-        fields = ('id', 'name', 'description', 'price', 'stock', 'image', 'category', 'category_name', 'is_available', 'created_at', 'updated_at')
-        read_only_fields = ('id', 'category_name', 'created_at', 'updated_at')
+        fields = ('id', 'name', 'description', 'price', 'stock', 'total_stock', 'image', 'category', 'category_name', 'is_available',
+                  'avg_rating', 'review_count', 'rating_histogram', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'total_stock', 'category_name', 'avg_rating', 'review_count', 'rating_histogram', 'created_at', 'updated_at')
+        property_sources = {
+            'total_stock': ('stock', 'stock_shard_count', 'stock_shards__stock'),
+            'rating_histogram': tuple(f'rating_{star}_count' for star in range(1, 6)),
+        }
 
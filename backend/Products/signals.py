@@ -0,0 +1,42 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from Category.models import Category
+from .models import Product
+from . import cache as catalog_cache
+from . import search
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_catalog_cache(sender, **kwargs):
+    # Bump after commit so no worker rebuilds from uncommitted data
+    catalog_cache.invalidate_on_commit()
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, **kwargs):
+    search.index_products([instance])
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    search.remove_products([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_products(sender, instance, created, **kwargs):
+    if not created:
+        search.index_products(instance.products.select_related('category'))
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_products(sender, instance, **kwargs):
+    # Products are detached (SET_NULL) without signals, so collect them first
+    instance._search_product_ids = list(instance.products.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+def reindex_detached_products(sender, instance, **kwargs):
+    product_ids = getattr(instance, '_search_product_ids', [])
+    if product_ids:
+        search.index_products(Product.objects.filter(id__in=product_ids).select_related('category'))
@@ -1,3 +1,40 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
+from . import search
+from .inventory import reserve_stock, shard_stock
+from .models import Product
 
-# Create your tests here.
+
+class ProductDetailValidatorTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.product = Product.objects.create(name='Lamp', description='d', price=10, stock=10)
+        with self.captureOnCommitCallbacks(execute=True):
+            shard_stock(self.product.id, 3)
+        self.url = f'/api/products/{self.product.id}/'
+
+    def test_shard_order_changes_validators(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.data['total_stock'], 10)
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve_stock({self.product.id: 1})
+
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data['total_stock'], 9)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+    def test_unchanged_product_is_not_modified(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+
+
+class ProductSearchTests(TestCase):
+    def test_unavailable_products_are_not_returned(self):
+        shown = Product.objects.create(name='Brass lamp', description='d', price=10, stock=1)
+        hidden = Product.objects.create(name='Brass lamp XL', description='d', price=20, stock=1)
+        search.index_products([shown, hidden])
+        # update() fires no signal, so the index still has the product
+        Product.objects.filter(pk=hidden.pk).update(is_available=False)
+        self.assertEqual([product.pk for product in search.search('brass')[:10]], [shown.pk])
@@ -1,10 +1,11 @@
 from django.urls import path
-from .views import ProductListView, ProductDetailView
+from .views import ProductListView, ProductDetailView, ProductSearchView
 
 app_name = 'products'
 
 urlpatterns = [
     path('', ProductListView.as_view(), name='product-list'),
+    path('search/', ProductSearchView.as_view(), name='product-search'),
     path('<int:id>/', ProductDetailView.as_view(), name='product-detail'),
 ]
 
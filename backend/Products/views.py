@@ -1,51 +1,125 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from django.db import IntegrityError
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+import hashlib
 import logging
-from .models import Product
+from django.db.models import Max, Sum
+from .models import Product, StockShard
 from .serializers import ProductSerializer
+from . import cache as catalog_cache
+from . import search
+from backend.pagination import KeysetPaginationMixin
+from backend.prefetch import AutoPrefetchMixin
 
 logger = logging.getLogger(__name__)
 
 
-class ProductDetailView(generics.RetrieveUpdateAPIView):
+class ProductDetailView(AutoPrefetchMixin, generics.RetrieveUpdateAPIView):
     """Get and update single product (for single product ecommerce)"""
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
     lookup_field = 'id'
 
-    def get_object(self):
-        try:
-            # For single product ecommerce, return the first product
-            product, created = Product.objects.get_or_create(
-                id=1,
-                defaults={
-                    'name': 'Default Product',
-                    'description': 'Product description',
-                    'price': 0.00,
-                    'stock': 0,
-                    'is_available': True
-                }
+    def get_loaded_fields(self, queryset):
+        # The validators below read these even when ?fields= leaves them out
+        return super().get_loaded_fields(queryset) | {'updated_at', 'category', 'stock_shard_count'}
+
+    def get_snapshot(self):
+        """Serialize the product along with its validators for conditional GETs"""
+        product = self.get_object()
+        modified = [product.updated_at]
+        if product.category is not None:
+            modified.append(product.category.updated_at)
+        parts = [str(stamp.timestamp()) for stamp in modified]
+        if product.stock_shard_count:
+            # Orders decrement shards without touching the product row
+            shards = StockShard.objects.filter(product=product).aggregate(
+                updated_at=Max('updated_at'), stock=Sum('stock')
             )
-            return product
-        except IntegrityError as e:
-            logger.error(f"Integrity error fetching product: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Error fetching product: {str(e)}")
-            raise
+            if shards['updated_at'] is not None:
+                modified.append(shards['updated_at'])
+                parts += [str(shards['updated_at'].timestamp()), str(shards['stock'])]
+        last_modified = max(modified)
+        etag = hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+        return {
+            'data': self.get_serializer(product).data,
+            'etag': f'"{product.pk}-{etag}"',
+            'last_modified': int(last_modified.timestamp()),
+        }
+
+    def retrieve(self, request, *args, **kwargs):
+        # Pure read served from the catalog cache; no DB hit on a warm entry
+        snapshot = catalog_cache.get_or_build(
+            f"detail:{self.kwargs.get(self.lookup_field)}?{request.META.get('QUERY_STRING', '')}",
+            self.get_snapshot
+        )
+        not_modified = get_conditional_response(
+            request,
+            etag=snapshot['etag'],
+            last_modified=snapshot['last_modified'],
+        )
+        if not_modified is not None:
+            return not_modified
+
+        response = Response(snapshot['data'])
+        response['ETag'] = snapshot['etag']
+        response['Last-Modified'] = http_date(snapshot['last_modified'])
+        return response
 
 
-class ProductListView(generics.ListAPIView):
-    """List products (filterable by category)"""
+class ProductListView(AutoPrefetchMixin, KeysetPaginationMixin, generics.ListAPIView):
+    """List products (filterable by category, sortable with ?ordering=)"""
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
+    orderings = {
+        'newest': ('-created_at', '-id'),
+        'rating': ('-avg_rating', '-review_count', '-id'),
+        'reviews': ('-review_count', '-avg_rating', '-id'),
+        'price': ('price', 'id'),
+        '-price': ('-price', '-id'),
+    }
+
+    @property
+    def keyset_ordering(self):
+        # Every ordering ends in id, so cursor pages follow ?ordering= too
+        request = getattr(self, 'request', None)
+        ordering = request.query_params.get('ordering') if request is not None else None
+        return self.orderings.get(ordering, self.orderings['newest'])
 
     def get_queryset(self):
-        queryset = Product.objects.filter(is_available=True)
+        queryset = Product.objects.filter(is_available=True).order_by(*self.keyset_ordering)
         category_id = self.request.query_params.get('category', None)
         if category_id:
             queryset = queryset.filter(category_id=category_id)
         return queryset
+
+    def list(self, request, *args, **kwargs):
+        # Pagination links are absolute, so key on the full URL
+        data = catalog_cache.get_or_build(
+            f"list:{request.build_absolute_uri()}",
+            lambda: super(ProductListView, self).list(request, *args, **kwargs).data
+        )
+        return Response(data)
+
+
+class ProductSearchView(AutoPrefetchMixin, generics.ListAPIView):
+    """Full-text product search ranked by relevance (?q=)"""
+    serializer_class = ProductSerializer
+    permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Product.objects.none()
+        return search.search(self.request.query_params.get('q', ''))
+
+    def list(self, request, *args, **kwargs):
+        if not search.build_match_query(request.query_params.get('q', '')):
+            return Response({'error': 'Query parameter q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        data = catalog_cache.get_or_build(
+            f"search:{request.build_absolute_uri()}",
+            lambda: super(ProductSearchView, self).list(request, *args, **kwargs).data
+        )
+        return Response(data)
@@ -0,0 +1,17 @@
+from django.contrib import admin
+from .models import DailyProductSales, DailyPaymentTotals
+
+
+@admin.register(DailyProductSales)
+class DailyProductSalesAdmin(admin.ModelAdmin):
+    list_display = ('day', 'product', 'status', 'order_count', 'quantity', 'revenue')
+    list_filter = ('status', 'day')
+    search_fields = ('product__name',)
+    date_hierarchy = 'day'
+
+
+@admin.register(DailyPaymentTotals)
+class DailyPaymentTotalsAdmin(admin.ModelAdmin):
+    list_display = ('day', 'paid_via', 'status', 'payment_count', 'amount')
+    list_filter = ('paid_via', 'status', 'day')
+    date_hierarchy = 'day'
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ReportConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'Report'
+    verbose_name = 'Report'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,44 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from Order.models import Order, ArchivedOrder
+from Report.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the daily sales rollups for a date range from the order and payment tables. '
+        'Defaults to everything from the first order until today.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First day (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last day, inclusive (YYYY-MM-DD)')
+        parser.add_argument('--days-per-batch', type=int, default=31, help='Days rebuilt per transaction')
+
+    def handle(self, *args, **options):
+        try:
+            end = parse_date(options['end']) if options['end'] else timezone.localdate()
+            if options['start']:
+                start = parse_date(options['start'])
+            else:
+                firsts = [
+                    model.objects.order_by('created_at').values_list('created_at', flat=True).first()
+                    for model in (Order, ArchivedOrder)
+                ]
+                firsts = [first for first in firsts if first]
+                start = timezone.localdate(min(firsts)) if firsts else end
+        except ValueError:
+            start = end = None
+        if start is None or end is None or start > end:
+            raise CommandError('--start and --end must be dates (YYYY-MM-DD) with start <= end')
+
+        step = timedelta(days=max(options['days_per_batch'], 1))
+        batch_start = start
+        while batch_start <= end:
+            batch_end = min(batch_start + step - timedelta(days=1), end)
+            rebuild(batch_start, batch_end)
+            self.stdout.write(f"Rebuilt {batch_start} .. {batch_end}")
+            batch_start = batch_end + timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f"Sales rollups rebuilt for {start} .. {end}"))
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('Products', '0006_stock_shards'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyPaymentTotals',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('paid_via', models.CharField(max_length=50)),
+                ('status', models.CharField(max_length=20)),
+                ('payment_count', models.IntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'verbose_name': 'Daily Payment Totals',
+                'verbose_name_plural': 'Daily Payment Totals',
+                'db_table': 'report_daily_payment_totals',
+                'unique_together': {('day', 'paid_via', 'status')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('order_count', models.IntegerField(default=0)),
+                ('quantity', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='Products.product')),
+            ],
+            options={
+                'verbose_name': 'Daily Product Sales',
+                'verbose_name_plural': 'Daily Product Sales',
+                'db_table': 'report_daily_product_sales',
+                'unique_together': {('day', 'product', 'status')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import models
+from Products.models import Product
+
+
+class DailyProductSales(models.Model):
+    """Orders per day, product and order status, maintained incrementally"""
+    day = models.DateField()
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_sales')
+    status = models.CharField(max_length=20)
+    order_count = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'report_daily_product_sales'
+        verbose_name = 'Daily Product Sales'
+        verbose_name_plural = 'Daily Product Sales'
+        unique_together = ['day', 'product', 'status']
+
+    def __str__(self):
+        return f"{self.day} - {self.product_id} - {self.status}"
+
+
+class DailyPaymentTotals(models.Model):
+    """Payments per day, payment method and payment status, maintained incrementally"""
+    day = models.DateField()
+    paid_via = models.CharField(max_length=50)
+    status = models.CharField(max_length=20)
+    payment_count = models.IntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'report_daily_payment_totals'
+        verbose_name = 'Daily Payment Totals'
+        verbose_name_plural = 'Daily Payment Totals'
+        unique_together = ['day', 'paid_via', 'status']
+
+    def __str__(self):
+        return f"{self.day} - {self.paid_via} - {self.status}"
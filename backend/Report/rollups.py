@@ -0,0 +1,150 @@
+"""
+Daily sales rollups.
+
+DailyProductSales and DailyPaymentTotals hold one row per (day, product,
+status) and (day, paid_via, status). Every order or payment write adds its
+contribution with an INSERT ... ON CONFLICT DO UPDATE in the same transaction,
+and a status change moves the contribution from the old bucket to the new one.
+Reports then read only these small tables. rebuild() recomputes any date range
+from the source tables, archives included.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from backend.db import upsert_add
+from Order.models import Order, ArchivedOrder
+from Payment.models import Payment, ArchivedPayment
+from .models import DailyProductSales, DailyPaymentTotals
+
+
+def _day(moment):
+    return timezone.localdate(moment) if timezone.is_aware(moment) else moment.date()
+
+
+def order_bucket(values):
+    return _day(values['created_at']), values['product_id'], values['status']
+
+
+def payment_bucket(values):
+    return _day(values['payment_date']), values['paid_via'], values['status']
+
+
+def add_orders(rows, sign=1):
+    """Add (sign=1) or remove (sign=-1) orders given as dicts of their fields"""
+    totals = defaultdict(lambda: [0, 0, Decimal('0')])
+    for values in rows:
+        bucket = totals[order_bucket(values)]
+        bucket[0] += sign
+        bucket[1] += sign * values['quantity']
+        bucket[2] += sign * Decimal(values['total_price'])
+    for (day, product_id, status), (order_count, quantity, revenue) in sorted(totals.items()):
+        upsert_add(
+            DailyProductSales,
+            keys={'day': day, 'product_id': product_id, 'status': status},
+            increments={'order_count': order_count, 'quantity': quantity, 'revenue': revenue},
+        )
+
+
+def add_payments(rows, sign=1):
+    """Add (sign=1) or remove (sign=-1) payments given as dicts of their fields"""
+    totals = defaultdict(lambda: [0, Decimal('0')])
+    for values in rows:
+        bucket = totals[payment_bucket(values)]
+        bucket[0] += sign
+        bucket[1] += sign * Decimal(values['amount'])
+    for (day, paid_via, status), (payment_count, amount) in sorted(totals.items()):
+        upsert_add(
+            DailyPaymentTotals,
+            keys={'day': day, 'paid_via': paid_via, 'status': status},
+            increments={'payment_count': payment_count, 'amount': amount},
+        )
+
+
+ORDER_FIELDS = ('created_at', 'product_id', 'status', 'quantity', 'total_price')
+PAYMENT_FIELDS = ('payment_date', 'paid_via', 'status', 'amount')
+
+
+def order_values(order):
+    return {name: getattr(order, name) for name in ORDER_FIELDS}
+
+
+def payment_values(payment):
+    return {name: getattr(payment, name) for name in PAYMENT_FIELDS}
+
+
+def record_orders(orders):
+    """Count orders created without signals, e.g. by bulk_create()"""
+    add_orders([order_values(order) for order in orders])
+
+
+def _day_range(start, end):
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, time.min), tz),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    )
+
+
+def _grouped(querysets, date_field, keys, sums):
+    """Merge GROUP BY day results from several tables into {(day, *keys): [sums]}"""
+    totals = defaultdict(lambda: [0] * len(sums))
+    for queryset in querysets:
+        rows = (
+            queryset.annotate(day=TruncDate(date_field))
+            .values('day', *keys)
+            .annotate(**sums)
+            .order_by()
+        )
+        for row in rows.iterator(chunk_size=2000):
+            bucket = totals[(row['day'], *(row[key] for key in keys))]
+            for index, name in enumerate(sums):
+                bucket[index] += row[name]
+    return totals
+
+
+def rebuild(start, end):
+    """
+    Recompute the rollups for days start..end (inclusive) from the live and
+    archived order and payment tables
+    """
+    lower, upper = _day_range(start, end)
+    with transaction.atomic():
+        # Delete first so the rollup rows are locked before the source tables are read
+        DailyProductSales.objects.filter(day__gte=start, day__lte=end).delete()
+        DailyPaymentTotals.objects.filter(day__gte=start, day__lte=end).delete()
+        orders = _grouped(
+            [
+                model.objects.filter(created_at__gte=lower, created_at__lt=upper)
+                for model in (Order, ArchivedOrder)
+            ],
+            'created_at',
+            ('product_id', 'status'),
+            {'order_count': Count('id'), 'quantity': Sum('quantity'), 'revenue': Sum('total_price')},
+        )
+        payments = _grouped(
+            [
+                model.objects.filter(payment_date__gte=lower, payment_date__lt=upper)
+                for model in (Payment, ArchivedPayment)
+            ],
+            'payment_date',
+            ('paid_via', 'status'),
+            {'payment_count': Count('id'), 'amount': Sum('amount')},
+        )
+        DailyProductSales.objects.bulk_create(
+            DailyProductSales(
+                day=day, product_id=product_id, status=status,
+                order_count=order_count, quantity=quantity, revenue=revenue
+            )
+            for (day, product_id, status), (order_count, quantity, revenue) in orders.items()
+        )
+        DailyPaymentTotals.objects.bulk_create(
+            DailyPaymentTotals(
+                day=day, paid_via=paid_via, status=status, payment_count=payment_count, amount=amount
+            )
+            for (day, paid_via, status), (payment_count, amount) in payments.items()
+        )
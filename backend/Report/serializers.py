@@ -0,0 +1,38 @@
+from rest_framework import serializers
+
+
+class SalesTotalsSerializer(serializers.Serializer):
+    """Serializer for order totals over the report range"""
+    order_count = serializers.IntegerField()
+    quantity = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class SalesDaySerializer(SalesTotalsSerializer):
+    """Serializer for order totals of one day"""
+    day = serializers.DateField()
+
+
+class SalesProductSerializer(SalesTotalsSerializer):
+    """Serializer for order totals of one product"""
+    product_id = serializers.IntegerField()
+    product_name = serializers.CharField(source='product__name')
+
+
+class PaymentTotalsSerializer(serializers.Serializer):
+    """Serializer for payment totals per method and status"""
+    paid_via = serializers.CharField()
+    status = serializers.CharField()
+    payment_count = serializers.IntegerField()
+    amount = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class SalesReportSerializer(serializers.Serializer):
+    """Serializer for the sales report"""
+    start = serializers.DateField()
+    end = serializers.DateField()
+    statuses = serializers.ListField(child=serializers.CharField())
+    totals = SalesTotalsSerializer()
+    by_day = SalesDaySerializer(many=True)
+    by_product = SalesProductSerializer(many=True)
+    payments = PaymentTotalsSerializer(many=True)
@@ -0,0 +1,67 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models import QuerySet
+from django.dispatch import receiver
+from Order.models import Order
+from Products.models import Product
+from Payment.models import Payment
+from .rollups import ORDER_FIELDS, PAYMENT_FIELDS, add_orders, add_payments, order_values, payment_values
+
+
+def _previous(sender, instance, fields):
+    if instance._state.adding or instance.pk is None:
+        return None
+    return sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+
+
+@receiver(pre_save, sender=Order)
+def remember_order(sender, instance, **kwargs):
+    instance._report_previous = _previous(sender, instance, ORDER_FIELDS)
+
+
+@receiver(post_save, sender=Order)
+def roll_up_order(sender, instance, created, **kwargs):
+    current = order_values(instance)
+    previous = getattr(instance, '_report_previous', None)
+    if created or previous is None:
+        add_orders([current])
+    elif previous != current:
+        # Status (or quantity/price) changed: move the contribution between buckets
+        add_orders([previous], sign=-1)
+        add_orders([current])
+
+
+def _deleting_product(origin):
+    """Whether a delete() was started on a product (instance or queryset)"""
+    if isinstance(origin, QuerySet):
+        return origin.model is Product
+    return isinstance(origin, Product)
+
+
+@receiver(post_delete, sender=Order)
+def unroll_order(sender, instance, origin=None, **kwargs):
+    # When the product itself is deleted its rollup rows are cascade-deleted with
+    # it; re-creating one here would reference the product being removed
+    if _deleting_product(origin):
+        return
+    add_orders([order_values(instance)], sign=-1)
+
+
+@receiver(pre_save, sender=Payment)
+def remember_payment(sender, instance, **kwargs):
+    instance._report_previous = _previous(sender, instance, PAYMENT_FIELDS)
+
+
+@receiver(post_save, sender=Payment)
+def roll_up_payment(sender, instance, created, **kwargs):
+    current = payment_values(instance)
+    previous = getattr(instance, '_report_previous', None)
+    if created or previous is None:
+        add_payments([current])
+    elif previous != current:
+        add_payments([previous], sign=-1)
+        add_payments([current])
+
+
+@receiver(post_delete, sender=Payment)
+def unroll_payment(sender, instance, **kwargs):
+    add_payments([payment_values(instance)], sign=-1)
@@ -0,0 +1,41 @@
+from django.test import TestCase
+from AuthUser.models import User
+from Order.models import Order
+from Products.models import Product
+from .models import DailyProductSales
+from .rollups import rebuild
+
+
+class OrderRollupDeleteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='buyer', password='x')
+        self.product = Product.objects.create(name='Lamp', description='d', price=10, stock=5)
+        self.order = Order.objects.create(
+            user=self.user, product=self.product, quantity=2, total_price=20, shipping_address_text='x'
+        )
+
+    def test_deleting_order_removes_its_contribution(self):
+        self.order.delete()
+        row = DailyProductSales.objects.get(product=self.product)
+        self.assertEqual((row.order_count, row.quantity), (0, 0))
+
+    def test_deleting_product_with_orders(self):
+        self.product.delete()
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(DailyProductSales.objects.exists())
+
+    def test_deleting_products_queryset_with_orders(self):
+        Product.objects.filter(pk=self.product.pk).delete()
+        self.assertFalse(DailyProductSales.objects.exists())
+
+
+class RollupRebuildTests(TestCase):
+    def test_rebuild_matches_incremental_rollups(self):
+        user = User.objects.create_user(username='buyer', password='x')
+        product = Product.objects.create(name='Lamp', description='d', price=10, stock=5)
+        Order.objects.create(user=user, product=product, quantity=3, total_price=30, shipping_address_text='x')
+        before = list(DailyProductSales.objects.values('day', 'product_id', 'status', 'order_count', 'quantity'))
+        today = before[0]['day']
+        rebuild(today, today)
+        after = list(DailyProductSales.objects.values('day', 'product_id', 'status', 'order_count', 'quantity'))
+        self.assertEqual(after, before)
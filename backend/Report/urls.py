@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import SalesReportView
+
+app_name = 'report'
+
+urlpatterns = [
+    path('sales/', SalesReportView.as_view(), name='sales-report'),
+]
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from rest_framework import generics, status
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+import logging
+from .models import DailyProductSales, DailyPaymentTotals
+from .serializers import SalesReportSerializer
+from Order.models import Order
+
+logger = logging.getLogger(__name__)
+
+
+class SalesReportView(generics.GenericAPIView):
+    """
+    Sales Report (admin only)
+
+    Order and payment totals for a date range, read from the daily rollup
+    tables only. Cancelled orders are left out unless ?status= asks for them.
+    """
+    serializer_class = SalesReportSerializer
+    permission_classes = [IsAdminUser]
+    queryset = DailyProductSales.objects.none()  # For Swagger schema generation
+    default_days = 30
+
+    @swagger_auto_schema(
+        operation_description="Get order and payment totals per day, product and payment method",
+        manual_parameters=[
+            openapi.Parameter('start', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                              description='First day (default: 30 days before end)'),
+            openapi.Parameter('end', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                              description='Last day, inclusive (default: today)'),
+            openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description='Comma-separated order statuses (default: all but cancelled)'),
+            openapi.Parameter('product_id', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        responses={
+            200: SalesReportSerializer,
+            400: 'Bad request - invalid date or status',
+            403: 'Admin access required'
+        }
+    )
+    def get(self, request):
+        """Get sales report"""
+        params = request.query_params
+        try:
+            end = parse_date(params['end']) if params.get('end') else timezone.localdate()
+            start = parse_date(params['start']) if params.get('start') else end - timedelta(days=self.default_days - 1)
+        except ValueError:
+            start = end = None
+        if start is None or end is None or start > end:
+            return Response({'error': 'start and end must be dates (YYYY-MM-DD) with start <= end'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        valid_statuses = [choice for choice, _ in Order.STATUS_CHOICES]
+        if params.get('status'):
+            statuses = [value.strip() for value in params['status'].split(',') if value.strip()]
+            if not set(statuses) <= set(valid_statuses):
+                return Response({'error': f"status must be one of {', '.join(valid_statuses)}"},
+                                status=status.HTTP_400_BAD_REQUEST)
+        else:
+            statuses = [choice for choice in valid_statuses if choice != 'cancelled']
+
+        try:
+            sales = DailyProductSales.objects.filter(day__gte=start, day__lte=end, status__in=statuses)
+            if params.get('product_id'):
+                sales = sales.filter(product_id=params['product_id'])
+            sums = {'order_count': Sum('order_count'), 'quantity': Sum('quantity'), 'revenue': Sum('revenue')}
+
+            totals = sales.aggregate(**sums)
+            report = {
+                'start': start,
+                'end': end,
+                'statuses': statuses,
+                'totals': {name: value or 0 for name, value in totals.items()},
+                'by_day': sales.values('day').annotate(**sums).order_by('day'),
+                'by_product': sales.values('product_id', 'product__name').annotate(**sums).order_by('-revenue'),
+                'payments': (
+                    DailyPaymentTotals.objects.filter(day__gte=start, day__lte=end)
+                    .values('paid_via', 'status')
+                    .annotate(payment_count=Sum('payment_count'), amount=Sum('amount'))
+                    .order_by('paid_via', 'status')
+                ),
+            }
+            return Response(SalesReportSerializer(report).data, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error(f"Error building sales report: {str(e)}")
+            return Response({'error': 'Error building sales report'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
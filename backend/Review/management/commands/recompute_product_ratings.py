@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from Review.ratings import recompute_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized rating aggregates on every product from its reviews'
+
+    def handle(self, *args, **options):
+        updated = recompute_ratings()
+        self.stdout.write(self.style.SUCCESS(f"Recomputed ratings for {updated} reviewed products"))
@@ -19,6 +19,11 @@ class Review(models.Model):
         verbose_name_plural = 'Reviews'
         unique_together = ['user', 'product']
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination seeks on (created_at, id)
+            models.Index(fields=['product', '-created_at', '-id'], name='review_product_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='review_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.product.name} - {self.rating} stars"
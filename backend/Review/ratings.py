@@ -0,0 +1,73 @@
+"""
+Incremental maintenance of the rating aggregates stored on Product.
+
+Every review write adjusts review_count, rating_total, the per-star counters
+and avg_rating with a single UPDATE using F() arithmetic, inside the caller's
+transaction. recompute_ratings() rebuilds everything from the review table.
+"""
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf, Now
+from Products.models import Product
+from Products import cache as catalog_cache
+from .models import Review
+
+STARS = range(1, 6)
+
+
+def apply_rating_change(product_id, added=None, removed=None):
+    """
+    Adjust a product's aggregates for one review write.
+    Pass added for a new rating, removed for a deleted one, or both for an edit.
+    """
+    if added == removed:
+        return
+    count_delta = (added is not None) - (removed is not None)
+    total_delta = (added or 0) - (removed or 0)
+
+    review_count = F('review_count') + count_delta
+    rating_total = F('rating_total') + total_delta
+    updates = {
+        'review_count': review_count,
+        'rating_total': rating_total,
+        # The right-hand side sees the old column values, so recompute from the new ones
+        'avg_rating': Coalesce(
+            Cast(rating_total, FloatField()) / NullIf(review_count, 0),
+            0.0,
+            output_field=FloatField()
+        ),
+        'updated_at': Now(),
+    }
+    if added is not None:
+        updates[f'rating_{added}_count'] = F(f'rating_{added}_count') + 1
+    if removed is not None:
+        updates[f'rating_{removed}_count'] = F(f'rating_{removed}_count') - 1
+
+    Product.objects.filter(pk=product_id).update(**updates)
+    catalog_cache.invalidate_on_commit()
+
+
+def recompute_ratings():
+    """Rebuild the aggregates of every product from the review table"""
+    aggregates = Review.objects.values('product_id').annotate(
+        review_count=Count('id'),
+        rating_total=Sum('rating'),
+        **{f'rating_{star}_count': Count('id', filter=Q(rating=star)) for star in STARS}
+    ).order_by()
+
+    fields = ['avg_rating', 'review_count', 'rating_total'] + [f'rating_{star}_count' for star in STARS]
+    products = []
+    for row in aggregates:
+        product = Product(pk=row['product_id'])
+        product.review_count = row['review_count']
+        product.rating_total = row['rating_total']
+        product.avg_rating = row['rating_total'] / row['review_count']
+        for star in STARS:
+            setattr(product, f'rating_{star}_count', row[f'rating_{star}_count'])
+        products.append(product)
+
+    with transaction.atomic():
+        Product.objects.update(**{field: 0 for field in fields})
+        Product.objects.bulk_update(products, fields, batch_size=500)
+        catalog_cache.invalidate_on_commit()
+    return len(products)
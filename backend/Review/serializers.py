@@ -2,9 +2,10 @@ from rest_framework import serializers
 from .models import Review
 from AuthUser.serializers import UserSerializer
 from Products.serializers import ProductSerializer
+from backend.serializers import DynamicFieldsModelSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(DynamicFieldsModelSerializer):
     """Serializer for Review model"""
     user = UserSerializer(read_only=True)
     product = ProductSerializer(read_only=True)
@@ -13,6 +14,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'user', 'product', 'rating', 'comment', 'created_at', 'updated_at')
         read_only_fields = ('id', 'user', 'created_at', 'updated_at')
+        expandable_fields = ('user', 'product')
 
 
 class ReviewCreateSerializer(serializers.Serializer):
@@ -5,12 +5,15 @@ from django.db import IntegrityError, transaction
 import logging
 from .models import Review
 from .serializers import ReviewSerializer, ReviewCreateSerializer
+from .ratings import apply_rating_change
 from Products.models import Product
+from backend.pagination import KeysetPaginationMixin
+from backend.prefetch import AutoPrefetchMixin
 
 logger = logging.getLogger(__name__)
 
 
-class ReviewListView(generics.ListCreateAPIView):
+class ReviewListView(AutoPrefetchMixin, KeysetPaginationMixin, generics.ListCreateAPIView):
     """List all reviews and create new reviews"""
     serializer_class = ReviewSerializer
 
@@ -48,16 +51,20 @@ class ReviewListView(generics.ListCreateAPIView):
 
             try:
                 with transaction.atomic():
-                    review, created = Review.objects.get_or_create(
+                    review, created = Review.objects.select_for_update().get_or_create(
                         user=request.user,
                         product=product,
                         defaults={'rating': rating, 'comment': comment}
                     )
 
-                    if not created:
+                    if created:
+                        apply_rating_change(product.id, added=rating)
+                    else:
+                        previous_rating = review.rating
                         review.rating = rating
                         review.comment = comment
                         review.save()
+                        apply_rating_change(product.id, added=rating, removed=previous_rating)
 
                 return Response(ReviewSerializer(review).data, status=status.HTTP_201_CREATED)
             except IntegrityError as e:
@@ -71,7 +78,7 @@ class ReviewListView(generics.ListCreateAPIView):
             return Response({'error': 'An unexpected error occurred'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ReviewDetailView(AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific review"""
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated]
@@ -83,3 +90,17 @@ class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
         if self.request.user.is_staff:
             return Review.objects.all()
         return Review.objects.filter(user=self.request.user)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            previous_rating = Review.objects.select_for_update().values_list('rating', flat=True).get(
+                pk=serializer.instance.pk
+            )
+            review = serializer.save()
+            apply_rating_change(review.product_id, added=review.rating, removed=previous_rating)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            rating = Review.objects.select_for_update().values_list('rating', flat=True).get(pk=instance.pk)
+            instance.delete()
+            apply_rating_change(instance.product_id, removed=rating)
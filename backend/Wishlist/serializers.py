@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import Wishlist
 from Products.serializers import ProductSerializer
+from backend.serializers import DynamicFieldsModelSerializer
 
 
-class WishlistSerializer(serializers.ModelSerializer):
+class WishlistSerializer(DynamicFieldsModelSerializer):
     """Serializer for Wishlist model"""
     product = ProductSerializer(read_only=True)
 
@@ -11,6 +12,7 @@ class WishlistSerializer(serializers.ModelSerializer):
         model = Wishlist
         fields = ('id', 'product', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+        expandable_fields = ('product',)
 
 
 class WishlistCreateSerializer(serializers.Serializer):
@@ -6,11 +6,12 @@ import logging
 from .models import Wishlist
 from .serializers import WishlistSerializer, WishlistCreateSerializer
 from Products.models import Product
+from backend.prefetch import AutoPrefetchMixin
 
 logger = logging.getLogger(__name__)
 
 
-class WishlistListView(generics.ListCreateAPIView):
+class WishlistListView(AutoPrefetchMixin, generics.ListCreateAPIView):
     """List user's wishlist items and add items to wishlist"""
     permission_classes = [IsAuthenticated]
 
@@ -60,7 +61,7 @@ class WishlistListView(generics.ListCreateAPIView):
             return Response({'error': 'An unexpected error occurred'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class WishlistDetailView(generics.RetrieveDestroyAPIView):
+class WishlistDetailView(AutoPrefetchMixin, generics.RetrieveDestroyAPIView):
     """Get or delete a specific wishlist item"""
     serializer_class = WishlistSerializer
     permission_classes = [IsAuthenticated]
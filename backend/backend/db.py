@@ -0,0 +1,84 @@
+"""
+Database helpers shared across apps.
+"""
+from django.db import connection, transaction
+from django.db.models import F
+
+UPSERT_VENDORS = ('sqlite', 'postgresql')
+
+
+def upsert_add(model, keys, increments, values=None, insert_values=None):
+    """
+    Insert a row or, when the unique key already exists, add to its counters.
+
+    keys: {field: value} matching a unique constraint on model
+    increments: {field: amount} added to the existing row on conflict
+    values: {field: value} written on insert and overwritten on conflict
+    insert_values: {field: value} only written when the row is inserted
+
+    Runs as a single INSERT ... ON CONFLICT DO UPDATE statement, so concurrent
+    callers never lose an increment. Returns the primary key of the row.
+    """
+    values = values or {}
+    insert_values = insert_values or {}
+
+    if connection.vendor not in UPSERT_VENDORS:
+        with transaction.atomic():
+            updated = model._default_manager.filter(**keys).update(
+                **{name: F(name) + amount for name, amount in increments.items()},
+                **values
+            )
+            if not updated:
+                return model._default_manager.create(**keys, **increments, **values, **insert_values).pk
+            return model._default_manager.filter(**keys).values_list('pk', flat=True).get()
+
+    meta = model._meta
+    quote = connection.ops.quote_name
+    table = quote(meta.db_table)
+
+    row = {**keys, **increments, **values, **insert_values}
+    # Like Model.save(), fill in field defaults the caller did not pass
+    for field in meta.concrete_fields:
+        if not field.primary_key and field.has_default() and field.name not in row and field.attname not in row:
+            row[field.attname] = field.get_default()
+
+    columns, params = [], []
+    for name, value in row.items():
+        field = meta.get_field(name)
+        columns.append(quote(field.column))
+        params.append(field.get_db_prep_save(value, connection))
+
+    def column(name):
+        return quote(meta.get_field(name).column)
+
+    assignments = [
+        f"{column(name)} = {table}.{column(name)} + excluded.{column(name)}" for name in increments
+    ] + [
+        f"{column(name)} = excluded.{column(name)}" for name in values
+    ]
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+        f"ON CONFLICT ({', '.join(column(name) for name in keys)}) DO UPDATE SET {', '.join(assignments)} "
+        f"RETURNING {quote(meta.pk.column)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+
+def delete_rows(model, pks):
+    """
+    DELETE rows by primary key in one statement, without loading them and
+    without model signals or ORM-level cascades. The caller is responsible
+    for anything that references the rows.
+    """
+    if not pks:
+        return 0
+    meta = model._meta
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(meta.db_table)} WHERE {quote(meta.pk.column)} IN ({', '.join(['%s'] * len(pks))})",
+            list(pks)
+        )
+        return cursor.rowcount
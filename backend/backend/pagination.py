@@ -0,0 +1,155 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Instead of COUNT(*) + OFFSET, each page seeks past the last row of the previous
+page on a composite ordering such as (created_at, id), so page N costs the same
+as page 1 when a matching index exists. Cursors are opaque base64 tokens.
+"""
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Seek pagination over a composite, unique ordering"""
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering=('-created_at', '-id')):
+        self.ordering = tuple(ordering)
+        self.page_size = api_settings.PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self._invert(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(ordering, position))
+
+        # Fetch one extra row to find out if there is another page
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        position = [
+            self.model._meta.get_field(name.lstrip('-')).value_to_string(instance)
+            for name in self.ordering
+        ]
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            raw_position = payload['p']
+            if len(raw_position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(name.lstrip('-')).to_python(value)
+                for name, value in zip(self.ordering, raw_position)
+            ]
+            return position, bool(payload.get('r'))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _invert(self, ordering):
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+    def _seek_filter(self, ordering, position):
+        # (a, b) > (x, y)  ==  a > x OR (a = x AND b > y)
+        condition = Q()
+        for index, name in enumerate(ordering):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            clause = Q(**{f'{field}__{lookup}': position[index]})
+            for previous_name, previous_value in zip(ordering[:index], position[:index]):
+                clause &= Q(**{previous_name.lstrip('-'): previous_value})
+            condition |= clause
+        return condition
+
+
+class KeysetPaginationMixin:
+    """
+    Lets a list view opt into keyset pagination, either per request with
+    ?pagination=cursor (or by passing a cursor) or for every request by listing
+    the view in settings.KEYSET_PAGINATION_VIEWS.
+    """
+    keyset_ordering = ('-created_at', '-id')
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_keyset_pagination():
+                self._paginator = KeysetPagination(self.keyset_ordering)
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def use_keyset_pagination(self):
+        if getattr(self, 'request', None) is None:
+            return False
+        params = self.request.query_params
+        mode = params.get('pagination')
+        if mode:
+            return mode == 'cursor'
+        if KeysetPagination.cursor_query_param in params:
+            return True
+        return type(self).__name__ in getattr(settings, 'KEYSET_PAGINATION_VIEWS', ())
@@ -0,0 +1,205 @@
+"""
+Automatic select_related / prefetch_related planning.
+
+plan_related() walks a serializer's readable fields, follows each field's
+source through the model's relations and returns the joins the serializer
+will need: forward foreign keys and one-to-ones become select_related paths,
+reverse and many-to-many relations become prefetch_related paths. Nested
+serializers are walked recursively, so PaymentSerializer -> order -> product
+-> category is loaded with one query per page instead of several per row.
+
+Serializers can add paths the walk cannot see with Meta.select_related /
+Meta.prefetch_related, and describe what a model property reads with
+Meta.property_sources = {'field': ('column', 'relation__column')}. Paths are
+relative to the serializer's model.
+
+For a serializer shaped with ?fields= / ?expand= (see backend.serializers),
+plan_only() also works out the columns to load so the queryset can be
+narrowed with only().
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from django.db.models.query import ModelIterable
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+
+def _join(prefix, name):
+    return f'{prefix}__{name}' if prefix else name
+
+
+def _model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _relation(model, name):
+    field = _model_field(model, name)
+    return field if field is not None and field.is_relation and field.related_model is not None else None
+
+
+def _nested(field):
+    """The nested serializer behind field, or None"""
+    nested = field.child if isinstance(field, serializers.ListSerializer) else field
+    return nested if isinstance(nested, serializers.BaseSerializer) and hasattr(nested, 'fields') else None
+
+
+def _readable(serializer):
+    for name, field in serializer.fields.items():
+        if not field.write_only:
+            yield name, field
+
+
+def _follow(model, attrs, prefix, many, select, prefetch):
+    """Record the relations along attrs; returns (model, path, many) at the end or None"""
+    path, current = prefix, model
+    for attr in attrs:
+        relation = _relation(current, attr)
+        if relation is None:
+            return None
+        path = _join(path, attr)
+        many = many or relation.one_to_many or relation.many_to_many
+        (prefetch if many else select).add(path)
+        current = relation.related_model
+    return current, path, many
+
+
+def _walk(serializer, model, prefix, many, select, prefetch):
+    """Collect the paths serializer needs; prefix is the path from the root model"""
+    meta = getattr(serializer, 'Meta', None)
+    for path in getattr(meta, 'select_related', ()):
+        (prefetch if many else select).add(_join(prefix, path))
+    for path in getattr(meta, 'prefetch_related', ()):
+        prefetch.add(_join(prefix, path))
+    property_sources = getattr(meta, 'property_sources', {})
+
+    for name, field in _readable(serializer):
+        for path in property_sources.get(name, ()):
+            # Join the relations leading up to the column the property reads
+            _follow(model, path.split('__')[:-1], prefix, many, select, prefetch)
+        if field.source == '*':
+            continue
+        nested = _nested(field)
+        # A bare PrimaryKeyRelatedField reads the local <name>_id column
+        if isinstance(field, RelatedField) and len(field.source_attrs) == 1:
+            continue
+        end = _follow(model, field.source_attrs, prefix, many, select, prefetch)
+        if end is None:
+            continue
+        current, path, through_many = end
+        if isinstance(field, ManyRelatedField):
+            prefetch.add(path)
+        elif nested is not None:
+            _walk(nested, current, path, through_many, select, prefetch)
+
+
+def plan_related(serializer, model):
+    """Return (select_related, prefetch_related) path lists for serializer over model"""
+    select, prefetch = set(), set()
+    _walk(serializer, model, '', False, select, prefetch)
+    # Drop paths implied by a longer one (select_related('a__b') also joins 'a')
+    select = [path for path in select if not any(other.startswith(f'{path}__') for other in select)]
+    prefetch = [path for path in prefetch if not any(other.startswith(f'{path}__') for other in prefetch)]
+    return sorted(select), sorted(prefetch)
+
+
+def _loadable(model, path):
+    """Whether path reaches a column through forward relations only"""
+    current = model
+    for attr in path.split('__'):
+        field = _model_field(current, attr) if current is not None else None
+        if field is None or not field.concrete:
+            return False
+        current = field.related_model
+    return True
+
+
+def _columns(serializer, model, prefix):
+    """
+    Columns of model (as only() paths) that serializer reads, or None when a
+    field reads something that cannot be mapped to columns
+    """
+    columns = set()
+    property_sources = getattr(getattr(serializer, 'Meta', None), 'property_sources', {})
+    for name, field in _readable(serializer):
+        if name in property_sources:
+            for path in property_sources[name]:
+                if _loadable(model, path):
+                    columns.add(_join(prefix, path))
+            continue
+        if field.source == '*':
+            return None
+        path, current = prefix, model
+        for index, attr in enumerate(field.source_attrs):
+            model_field = _model_field(current, attr)
+            if model_field is None:
+                return None
+            if not model_field.concrete:
+                # Reverse relation: prefetched separately, nothing to load here
+                break
+            path = _join(path, attr)
+            columns.add(path)
+            if not model_field.is_relation:
+                break
+            current = model_field.related_model
+            if index == len(field.source_attrs) - 1:
+                nested = _nested(field)
+                if nested is not None and not model_field.many_to_many:
+                    # Load only what the nested serializer reads, or the whole row
+                    columns.update(_columns(nested, current, path) or ())
+    return columns
+
+
+def plan_only(serializer, model):
+    """Return the only() paths serializer needs from model, or None to load everything"""
+    columns = _columns(serializer, model, '')
+    if columns is None:
+        return None
+    return sorted(columns)
+
+
+def optimize_queryset(queryset, serializer, narrow=False, keep=()):
+    """
+    Apply the joins serializer needs to queryset; with narrow=True also defer
+    the columns it does not read (keep lists extra columns to load)
+    """
+    # Only plain model querysets: values() rows, unions and custom result sets are left alone
+    if not isinstance(queryset, QuerySet) or queryset._iterable_class is not ModelIterable \
+            or queryset.query.combinator:
+        return queryset
+    select, prefetch = plan_related(serializer, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if narrow:
+        columns = plan_only(serializer, queryset.model)
+        if columns is not None:
+            queryset = queryset.only(*columns, *keep)
+    return queryset
+
+
+class AutoPrefetchMixin:
+    """
+    Loads the related objects the view's serializer renders along with the
+    queryset, for both list pages and get_object(). Reads shaped with
+    ?fields= / ?expand= also load only the columns they render.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, 'swagger_fake_view', False):
+            return queryset
+        serializer = self.get_serializer()
+        narrow = self.request.method in SAFE_METHODS and getattr(serializer, 'shaped', False)
+        return optimize_queryset(queryset, serializer, narrow=narrow, keep=self.get_loaded_fields(queryset))
+
+    def get_loaded_fields(self, queryset):
+        """Columns to load even if the serializer does not render them"""
+        ordering = list(getattr(self, 'keyset_ordering', ()))
+        if isinstance(queryset, QuerySet):
+            ordering += [name for name in queryset.query.order_by if isinstance(name, str)]
+        return {name.lstrip('-') for name in ordering if name.lstrip('-') != '?'}
@@ -0,0 +1,74 @@
+"""
+Sparse fieldsets and opt-in expansion.
+
+Serializers built on DynamicFieldsModelSerializer let the client choose the
+response shape:
+
+    ?fields=id,total_price,status         only these fields
+    ?fields=id,product.name,product.price nested fields with dotted names
+    ?expand=product,order.product         render these nested objects
+
+Without either parameter the legacy shape is returned unchanged. Once a client
+passes one of them, the fields listed in Meta.expandable_fields are rendered as
+their primary key unless they are named in ?expand= or have dotted subfields in
+?fields= (asking for product.name implies expanding product). Views using
+AutoPrefetchMixin then load only the columns and joins the shape needs.
+"""
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_paths(value):
+    """Turn 'a,b.c,b.d' into {'a': {}, 'b': {'c': {}, 'd': {}}}"""
+    tree = {}
+    for path in (value or '').split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer whose fields and nested expansions follow ?fields= / ?expand="""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shaped = False
+        request = self.context.get('request')
+        params = getattr(request, 'query_params', None)
+        if params is not None and (FIELDS_PARAM in params or EXPAND_PARAM in params):
+            fields = parse_paths(params.get(FIELDS_PARAM)) if FIELDS_PARAM in params else None
+            self.apply_shape(fields or None, parse_paths(params.get(EXPAND_PARAM)))
+
+    def apply_shape(self, fields, expand):
+        """
+        Keep only fields (a parse_paths() tree, None for all) and collapse the
+        expandable fields that are not in expand
+        """
+        self.shaped = True
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+        expandable = getattr(self.Meta, 'expandable_fields', ())
+        for name in list(self.fields):
+            field = self.fields[name]
+            subfields = (fields or {}).get(name) or None
+            if name in expandable and name not in expand and subfields is None:
+                self.fields[name] = self._collapsed(name, field)
+                continue
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, DynamicFieldsModelSerializer):
+                nested.apply_shape(subfields, expand.get(name, {}))
+
+    def _collapsed(self, name, field):
+        """Primary key field standing in for an unexpanded nested serializer"""
+        kwargs = {'read_only': True}
+        if field.source != name:
+            kwargs['source'] = field.source
+        if isinstance(field, serializers.ListSerializer):
+            kwargs['many'] = True
+        return serializers.PrimaryKeyRelatedField(**kwargs)
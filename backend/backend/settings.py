@@ -63,6 +63,9 @@ INSTALLED_APPS = [
     'Wishlist',
     'Address',
     'Payment',
+    'Idempotency',
+    'Outbox',
+    'Report',
 ]
 
 MIDDLEWARE = [
@@ -107,6 +110,71 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Shared counters (e.g. the catalog generation) live here. Point this at
+# Memcached/Redis in production so every worker sees the same values.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Maximum number of serialized product payloads kept per process
+CATALOG_CACHE_MAX_ENTRIES = 512
+
+# Seconds a user resolved from an access token is cached (0 disables the cache).
+# Saving or deleting a user drops its entry; use a shared cache across workers.
+AUTH_USER_CACHE_TTL = 60
+
+# Verified access tokens kept per process until they expire (0 disables)
+JWT_VERIFIED_CACHE_MAX_ENTRIES = 10000
+
+# Threads hashing passwords for the async login/registration views
+AUTH_HASHING_THREADS = 4
+
+# last_login write-behind (AuthUser/last_login.py): pending logins are written
+# in one UPDATE at least this often (seconds, 0 writes immediately) or once
+# this many users are pending.
+LAST_LOGIN_FLUSH_INTERVAL = 5
+LAST_LOGIN_BUFFER_MAX = 1000
+
+# Bloom filter over blacklisted refresh tokens (AuthUser/blacklist.py). Only
+# takes effect with a shared CACHES backend (ignored under LocMemCache). Expired
+# outstanding/blacklisted rows are removed by `python manage.py purge_token_blacklist`.
+TOKEN_BLACKLIST_FILTER_ENABLED = False
+TOKEN_BLACKLIST_FILTER_CAPACITY = 100000
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = 0.01
+
+# Checkout admission control (Order/admission.py). At most min(remaining stock,
+# MAX_IN_FLIGHT) units per product are being ordered at once; the rest get 429.
+# A single order line above MAX_IN_FLIGHT is admitted when nothing else is in flight.
+CHECKOUT_ADMISSION_ENABLED = True
+CHECKOUT_ADMISSION_MAX_IN_FLIGHT = 100
+CHECKOUT_ADMISSION_SNAPSHOT_TTL = 2  # seconds a cached stock snapshot is trusted
+CHECKOUT_ADMISSION_TOKEN_TTL = 60  # seconds before leaked tokens are reclaimed
+CHECKOUT_ADMISSION_RETRY_AFTER = 1  # Retry-After seconds sent with 429
+
+# Seconds a cart line holds its stock after being added or increased (0 disables holds).
+# Clear expired holds periodically with `python manage.py release_expired_cart_holds`.
+CART_RESERVATION_TTL = 0
+
+# Idempotency-Key handling for order and payment POSTs (Idempotency app)
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60  # seconds a stored response can be replayed
+IDEMPOTENCY_WAIT_TIMEOUT = 10  # seconds a duplicate waits for the first request to finish
+IDEMPOTENCY_LOCK_TIMEOUT = 60  # seconds before a key left processing by a dead request can be taken over
+
+# Outbox worker (`python manage.py run_outbox_worker`)
+OUTBOX_MAX_ATTEMPTS = 10  # attempts before an event is marked failed
+OUTBOX_RETRY_BACKOFF = 5  # seconds before the first retry, doubled on every attempt
+OUTBOX_RETRY_BACKOFF_MAX = 3600
+OUTBOX_CLAIM_TIMEOUT = 300  # seconds before events claimed by a dead worker are retried
+
+# order.created handler in Products/outbox_handlers.py warns at or below this stock
+LOW_STOCK_ALERT_THRESHOLD = 5
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -169,6 +237,10 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20
 }
 
+# List views (by class name) that always use keyset pagination instead of page
+# numbers. Any list view also switches per request with ?pagination=cursor.
+KEYSET_PAGINATION_VIEWS = []
+
 # JWT Settings
 from datetime import timedelta
 
@@ -177,7 +249,7 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
-    'UPDATE_LAST_LOGIN': True,
+    'UPDATE_LAST_LOGIN': False,  # last_login is buffered by AuthUser/last_login.py
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -185,6 +257,7 @@ SIMPLE_JWT = {
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    'TOKEN_REFRESH_SERIALIZER': 'AuthUser.serializers.FilteredTokenRefreshSerializer',
     'TOKEN_TYPE_CLAIM': 'token_type',
     # Cookie settings
     'AUTH_COOKIE': 'access_token',  # Cookie name for access token
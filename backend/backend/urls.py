@@ -47,6 +47,7 @@ urlpatterns = [
     path('api/wishlist/', include('Wishlist.urls')),
     path('api/addresses/', include('Address.urls')),
     path('api/payments/', include('Payment.urls')),
+    path('api/reports/', include('Report.urls')),
     
     # Swagger/OpenAPI URLs
     re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),